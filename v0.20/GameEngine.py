@@ -1,20 +1,69 @@
 import json
+import logging
 import os
-from player import Player
+import random
+import time
+from player import Player, VersionedPlayer
 from actioncard import ActionCardManager
-from gamestate import GameState, GameStatus
+from gamestate import GameState, GameStatus, VersionedGameState
 from commands import CommandManager, Command, QuitCommand, SkipTurnCommand, PlayCardCommand
+from metrics import command_metric_name
+from history import apply_changes, read_value
+from events import (EventBus, CardPlayed, EffectApplied, PlayerChanged, RoundIncremented,
+                    StatusChanged, StateRestored)
+
+logger = logging.getLogger(__name__)
 
 class ClassGameEngine:
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, save_file="playerdata.json", quiet=None,
+                 save_interval=None, journal=None, undo_history=None, track_versions=None,
+                 command_metrics=None):
+        # Headless engines never touch the save file
+        self.headless = headless
+        
+        # Quiet engines skip logging on hot paths entirely (default: quiet when headless)
+        self.quiet = headless if quiet is None else quiet
+        
+        # Per-engine save file so several engines can share a working directory
+        self.save_file = save_file
+        
+        # Write-behind persistence: saves are coalesced and written off the caller's thread
+        self._save_writer = None
+        if save_interval is not None and not headless:
+            # Imported here so engines without write-behind saves don't load the persistence layer
+            from PersistanceManager import WriteBehindWriter
+            self._save_writer = WriteBehindWriter(save_file, interval=save_interval)
+        
+        # Optional GameJournal recording every state-changing operation for replay
+        self.journal = journal
+        
+        # Optional UndoHistory holding compact deltas of each turn step
+        self.history = undo_history
+        
+        # Subscribers (GUI, autosave, logging) are told about changes instead of polling
+        self.events = EventBus()
+        
+        # Seeded RNG for reproducible deals (falls back to the global random module)
+        self.rng = random.Random(seed) if seed is not None else random
+        
         # Initialize ActionCard system
-        self.card_manager = ActionCardManager()
+        self.card_manager = ActionCardManager(rng=self.rng, verbose=not self.quiet)
+        
+        # Versioned state lets readers (the GUI) cache derived values; headless
+        # simulations skip the bookkeeping (default: track unless headless)
+        self.track_versions = not headless if track_versions is None else track_versions
+        self.state_class = VersionedGameState if self.track_versions else GameState
+        self.player_class = VersionedPlayer if self.track_versions else Player
         
         # Initialize centralized game state
-        self.state = GameState()
+        self.state = self.state_class()
         
-        # Initialize command manager
-        self.command_manager = CommandManager(self.card_manager)
+        # Initialize command manager with execution counters and latency histograms
+        # (default: on unless headless, where a turn is only a few microseconds)
+        self.command_manager = CommandManager(self.card_manager,
+                                              metrics=not headless if command_metrics is None else command_metrics)
+        # (metric name, start) of the accepted input whose latency run_level_loop completes
+        self._metric_pending = None
         
         # Player management (kept separate from state)
         self.players = []  # List of Player objects
@@ -41,7 +90,7 @@ class ClassGameEngine:
     @actioncards_played.setter
     def actioncards_played(self, value):
         """Legacy property setter"""
-        self.state.action_cards_played = value
+        self._set_state('action_cards_played', value)
     
     @property
     def activePlayerID(self):
@@ -51,7 +100,7 @@ class ClassGameEngine:
     @activePlayerID.setter
     def activePlayerID(self, value):
         """Legacy property setter"""
-        self.state.active_player_id = value
+        self._set_state('active_player_id', value)
     
     @property
     def currentActionKey(self):
@@ -61,7 +110,7 @@ class ClassGameEngine:
     @currentActionKey.setter
     def currentActionKey(self, value):
         """Legacy property setter"""
-        self.state.current_action_key = value
+        self._set_state('current_action_key', value)
     
     @property
     def counter_userinput_execution(self):
@@ -71,7 +120,7 @@ class ClassGameEngine:
     @counter_userinput_execution.setter
     def counter_userinput_execution(self, value):
         """Legacy property setter"""
-        self.state.user_input_counter = value
+        self._set_state('user_input_counter', value)
     
     @property
     def game_statusID(self):
@@ -83,13 +132,13 @@ class ClassGameEngine:
         """Legacy property setter"""
         # Convert integer to GameStatus enum
         if value == 0:
-            self.state.status = GameStatus.NOT_STARTED
+            self._set_state('status', GameStatus.NOT_STARTED)
         elif value == 1:
-            self.state.status = GameStatus.INITIALIZED
+            self._set_state('status', GameStatus.INITIALIZED)
         elif value == 1000:
-            self.state.status = GameStatus.RUNNING
+            self._set_state('status', GameStatus.RUNNING)
         elif value == -1:
-            self.state.status = GameStatus.COMPLETED
+            self._set_state('status', GameStatus.COMPLETED)
     
     @property
     def numberOfPlayers(self):
@@ -99,7 +148,7 @@ class ClassGameEngine:
     @numberOfPlayers.setter
     def numberOfPlayers(self, value):
         """Legacy property setter"""
-        self.state.number_of_players = value
+        self._set_state('number_of_players', value)
     
     @property
     def roundcounter(self):
@@ -109,7 +158,7 @@ class ClassGameEngine:
     @roundcounter.setter
     def roundcounter(self, value):
         """Legacy property setter"""
-        self.state.round_counter = value
+        self._set_state('round_counter', value)
     
     @property
     def userInput(self):
@@ -121,6 +170,108 @@ class ClassGameEngine:
         """Legacy property setter"""
         self._userInput = value
 
+    # =============================================================================
+    # OUTPUT
+    # =============================================================================
+    
+    def _log(self, message, *args, level=logging.DEBUG):
+        """Log a %-style message lazily; quiet engines skip the logging call altogether"""
+        if not self.quiet:
+            logger.log(level, message, *args)
+
+    # =============================================================================
+    # JOURNAL
+    # =============================================================================
+    
+    def _record(self, op, **fields):
+        """Append an operation to the journal (callers check self.journal first)"""
+        fields['op'] = op
+        self.journal.record(fields, self._journal_snapshot)
+    
+    def _journal_snapshot(self):
+        """Full engine state for journal keyframes"""
+        return {
+            'game_state': self.state.to_dict(),
+            'players': self.get_player_data()
+        }
+    
+    def _set_state(self, field, value):
+        """Set a GameState field from outside the turn flow, journaling the change"""
+        if self.journal is not None:
+            self._record('set', field=field, value=value.value if field == 'status' else value)
+        if self.history is not None and getattr(self.state, field) != value:
+            # A step of its own: it must not merge into the previous command's step,
+            # and like any new step it makes the undone steps unreachable
+            self.history.begin()
+            self.history.record([('state', field, getattr(self.state, field), value)])
+            self.history.commit()
+        if field == 'status' and StatusChanged in self.events.listening:
+            old_status = self.state.status
+            setattr(self.state, field, value)
+            self._publish_status_change(old_status)
+        else:
+            setattr(self.state, field, value)
+
+    # =============================================================================
+    # EVENTS
+    # =============================================================================
+    
+    def _publish_status_change(self, old_status):
+        """Publish StatusChanged if the status differs from old_status (callers check listening)"""
+        if self.state.status != old_status:
+            self.events.publish(StatusChanged(old_status, self.state.status))
+
+    # =============================================================================
+    # UNDO / REDO
+    # =============================================================================
+    
+    def _begin_undo_step(self, command, context):
+        """Open an undo step for an accepted command"""
+        changes = command.changes(context)
+        if changes is None:
+            # Earlier steps cannot be undone safely across a non-invertible command
+            self.history.clear()
+        else:
+            self.history.begin()
+            self.history.record(changes)
+    
+    def _track(self, *fields):
+        """Remember the current value of (target, key) fields for the undo history"""
+        return [(target, key, read_value(self, target, key)) for target, key in fields]
+    
+    def _record_tracked(self, tracked):
+        """Record the fields remembered by _track that have changed since"""
+        self.history.record([(target, key, old, read_value(self, target, key))
+                             for target, key, old in tracked])
+    
+    def undo(self):
+        """Take back the latest turn step; returns False if there is nothing to undo"""
+        if self.history is None:
+            return False
+        changes = self.history.pop_undo()
+        if changes is None:
+            return False
+        apply_changes(self, changes, undo=True)
+        if self.journal is not None:
+            self._record('snapshot', snapshot=self._journal_snapshot())
+        if StateRestored in self.events.listening:
+            self.events.publish(StateRestored('undo'))
+        return True
+    
+    def redo(self):
+        """Re-apply the latest undone turn step; returns False if there is nothing to redo"""
+        if self.history is None:
+            return False
+        changes = self.history.pop_redo()
+        if changes is None:
+            return False
+        apply_changes(self, changes, undo=False)
+        if self.journal is not None:
+            self._record('snapshot', snapshot=self._journal_snapshot())
+        if StateRestored in self.events.listening:
+            self.events.publish(StateRestored('redo'))
+        return True
+
     # =============================================================================
     # COMMAND CONTEXT BUILDER
     # =============================================================================
@@ -151,17 +302,22 @@ class ClassGameEngine:
         Returns:
             int: Number of players created, or 0 if quitting
         """
-        print("initialize_game executed")
+        self._log("initialize_game executed")
         
         # Handle quit command
         if isinstance(num_players, str) and num_players == 'q':
-            self.state.status = GameStatus.NOT_STARTED
+            self._set_state('status', GameStatus.NOT_STARTED)
             return 0
         
         # Validate and convert num_players
         validated_players = self._validate_player_count(num_players)
         if validated_players == 0:
             return 0
+        
+        if self.journal is not None:
+            self._record('init', num_players=validated_players, starting_endurance=starting_endurance)
+        if self.history is not None:
+            self.history.clear()
             
         # Create players and set up game state
         self._setup_players(validated_players, starting_endurance)
@@ -181,13 +337,13 @@ class ClassGameEngine:
             if isinstance(num_players, str):
                 num_players = int(num_players)
         except ValueError:
-            print("Invalid input. Using default 2 players.")
+            self._log("Invalid input. Using default 2 players.", level=logging.WARNING)
             return 2
             
         if 1 <= num_players <= 5:
             return num_players
         else:
-            print("Invalid input. Using default 2 players.")
+            self._log("Invalid input. Using default 2 players.", level=logging.WARNING)
             return 2
     
     def _setup_players(self, num_players, starting_endurance):
@@ -198,27 +354,34 @@ class ClassGameEngine:
         # Create Player objects with shared card manager
         self.players = []
         for player_id in range(1, num_players + 1):
-            player = Player(player_id, starting_endurance=starting_endurance, 
-                          card_manager=self.card_manager)
+            player = self.player_class(player_id, starting_endurance=starting_endurance, 
+                                       card_manager=self.card_manager)
             self.players.append(player)
         
         # Set first player as active
         self.players[0].set_active(True)
-        print(f"Created {num_players} players. Player 1 is active.")
+        self._log("Created %d players. Player 1 is active.", num_players, level=logging.INFO)
     
     def _deal_initial_cards(self, cards_per_player=6):
         """Deal initial cards to all players."""
-        print(f"Dealing {cards_per_player} cards to each player...")
+        self._log("Dealing %d cards to each player...", cards_per_player, level=logging.INFO)
         
         for player in self.players:
             player.deal_cards(num_cards=cards_per_player)
+            if self.journal is not None:
+                self._record('deal', player_id=player.player_id, actioncards=player.actioncards.copy())
         
-        print("Cards dealt successfully")
+        self._log("Cards dealt successfully", level=logging.INFO)
     
     def _save_and_display_state(self):
         """Save player data and display current state."""
-        self.save_player_data()
-        self.load_and_display_player_data()
+        if self.headless:
+            return
+        save_data = self.save_player_data()
+        
+        # Display what was just saved instead of re-reading the file
+        if save_data and logger.isEnabledFor(logging.INFO):
+            self._display_save_data(save_data)
 
     # =============================================================================
     # GAME STATUS SYSTEM
@@ -269,6 +432,17 @@ class ClassGameEngine:
                 return player
         return None
     
+    @property
+    def state_version(self):
+        """
+        Version of the latest change to the game state or any player
+        
+        Grows with every change; None when the engine does not track versions.
+        """
+        if not self.track_versions:
+            return None
+        return max([self.state.version] + [player.version for player in self.players])
+    
     def get_player_by_id(self, player_id):
         """Get player by ID"""
         for player in self.players:
@@ -278,10 +452,25 @@ class ClassGameEngine:
         
     def nextPlayer(self):
         """Switch to the next player in turn order."""
-        print("nextPlayer executed")
+        if self.journal is not None:
+            self._record('next_player')
+        return self._advance_player()
+    
+    def _advance_player(self, publish=True):
+        """
+        Deactivate the current player and activate the next one.
+        
+        Args:
+            publish: Publish PlayerChanged (False lets the caller publish once the turn state is reset)
+        """
+        self._log("nextPlayer executed")
         
         # Deactivate current player
         current_player = self.get_active_player()
+        if self.history is not None:
+            tracked = self._track(('state', 'active_player_id'),
+                                  ('active', self.state.active_player_id % self.state.number_of_players + 1),
+                                  *([('active', current_player.player_id)] if current_player else []))
         if current_player:
             current_player.set_active(False)
         
@@ -293,6 +482,10 @@ class ClassGameEngine:
         if next_player:
             next_player.set_active(True)
         
+        if self.history is not None:
+            self._record_tracked(tracked)
+        if publish and PlayerChanged in self.events.listening:
+            self.events.publish(PlayerChanged(current_player.player_id if current_player else 0, new_player_id))
         return new_player_id
 
     # =============================================================================
@@ -301,7 +494,7 @@ class ClassGameEngine:
 
     def userInput_prompt(self):
         """Get prompt text for GUI"""
-        print("userInput_prompt executed")
+        self._log("userInput_prompt executed")
         prompt_text = f"game statusID: {self.state.status.value} | active player: {self.state.active_player_id} | actioncards played: {self.state.action_cards_played} | userinputcounter: {self.state.user_input_counter}\n"
         prompt_text += f"Player {self.state.active_player_id}, enter a command (enter 'quit' or 'q' to exit): "
         return prompt_text
@@ -316,7 +509,14 @@ class ClassGameEngine:
         Map user input to valid game actions.
         Now uses Command Pattern internally while maintaining legacy behavior.
         """
-        print(f"map_userInput executed for {self.userInput}")
+        self._log("map_userInput executed for %s", self.userInput)
+        
+        # Latency covers an accepted input from parsing until run_level_loop finishes it,
+        # so the card update, effect, player advance, journaling and undo recording count too
+        metrics = self.command_manager.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+            self._metric_pending = None
         
         # Try to parse input as a command
         command = self.command_manager.parse_input(self.userInput)
@@ -327,34 +527,51 @@ class ClassGameEngine:
             
             # Check if command can be executed
             if not command.can_execute(context):
-                print(f"Command cannot be executed in current context")
+                self._log("Command cannot be executed in current context")
+                if metrics is not None:
+                    metrics.reject(command_metric_name(command))
                 return None
             
+            if self.journal is not None:
+                self._record('input', input=self.userInput)
+            if self.history is not None:
+                self._begin_undo_step(command, context)
+            
             # Execute command and handle result based on command type
             if isinstance(command, QuitCommand):
                 # Execute quit command
+                old_status = self.state.status
                 command.execute(context)
-                print("Exiting the program...")
-                return self.state.status.value
+                if StatusChanged in self.events.listening:
+                    self._publish_status_change(old_status)
+                self._log("Exiting the program...", level=logging.INFO)
+                result = self.state.status.value
                 
             elif isinstance(command, SkipTurnCommand):
                 # Execute skip command
                 command.execute(context)
-                return (self.state.action_cards_played, self.state.user_input_counter, self.state.current_action_key)
+                result = (self.state.action_cards_played, self.state.user_input_counter, self.state.current_action_key)
                 
             elif isinstance(command, PlayCardCommand):
                 # For play card commands, we need to maintain legacy behavior
                 # The command validates but we still use the legacy update flow
                 self.state.user_input_counter += 1
                 self.state.current_action_key = command.card_name
-                return self.state.current_action_key
+                result = self.state.current_action_key
             else:
                 # Unknown command type, try to handle generically
                 result = command.execute(context)
-                return result
+            
+            if metrics is not None:
+                if isinstance(command, QuitCommand):
+                    # Quitting ends the game; no run_level_loop follows
+                    metrics.observe(command_metric_name(command), time.perf_counter() - start)
+                else:
+                    self._metric_pending = (command_metric_name(command), start)
+            return result
         else:
             # No valid command found - maintain legacy behavior
-            print(f"User input {self.userInput} invalid.")
+            self._log("User input %s invalid.", self.userInput)
             return None
 
     def map_userInput_legacy(self):
@@ -362,11 +579,14 @@ class ClassGameEngine:
         LEGACY METHOD - Keep for reference/fallback
         Original map_userInput implementation
         """
-        print(f"map_userInput_legacy executed for {self.userInput}")
+        self._log("map_userInput_legacy executed for %s", self.userInput)
         
         if self.userInput in ["quit", "q"]:
-            print("Exiting the program...")
+            self._log("Exiting the program...", level=logging.INFO)
+            old_status = self.state.status
             self.state.status = GameStatus.COMPLETED
+            if StatusChanged in self.events.listening:
+                self._publish_status_change(old_status)
             return self.state.status.value
             
         elif self.userInput in ["skip", "s"]:
@@ -376,7 +596,7 @@ class ClassGameEngine:
             return (self.state.action_cards_played, self.state.user_input_counter, self.state.current_action_key)
             
         elif self.card_manager.validate_input(self.userInput):
-            print(f"{self.userInput.lower()} found in valid keywords")
+            self._log("%s found in valid keywords", self.userInput.lower())
             
             # Use ActionCardManager to resolve input to card name
             resolved_card_name = self.card_manager.resolve_input_to_card_name(self.userInput)
@@ -386,10 +606,10 @@ class ClassGameEngine:
                 self.state.current_action_key = resolved_card_name
                 return self.state.current_action_key
             else:
-                print(f"Could not resolve input: {self.userInput}")
+                self._log("Could not resolve input: %s", self.userInput)
                 return None
         else:
-            print(f"User input {self.userInput} invalid.")
+            self._log("User input %s invalid.", self.userInput)
             return None
 
     # =============================================================================
@@ -398,7 +618,10 @@ class ClassGameEngine:
 
     def update_actioncards(self):
         """Process action card play for the current player."""
-        print(f"update_actioncards executed for player {self.state.active_player_id}: play actioncard '{self.state.current_action_key}'")
+        if self.journal is not None:
+            self._record('update')
+        self._log("update_actioncards executed for player %d: play actioncard '%s'",
+                  self.state.active_player_id, self.state.current_action_key)
         
         if self.state.current_action_key in ["skip", "joker"]:
             return self.state.current_action_key
@@ -407,23 +630,47 @@ class ClassGameEngine:
             # Use Player class methods
             active_player = self.get_active_player()
             if active_player:
+                if self.history is not None:
+                    player_id = active_player.player_id
+                    tracked = self._track((player_id, self.state.current_action_key), (player_id, 'joker'),
+                                          ('played', player_id), ('state', 'action_cards_played'))
                 if active_player.play_card(self.state.current_action_key):
                     self.state.action_cards_played += 1
+                    if self.history is not None:
+                        self._record_tracked(tracked)
+                    if CardPlayed in self.events.listening:
+                        self.events.publish(CardPlayed(active_player.player_id, self.state.current_action_key,
+                                                       self.state.action_cards_played))
                     return (self.state.action_cards_played, self.get_player_data())
                 else:
-                    print("not enough actioncards")
+                    self._log("not enough actioncards")
                     return None
         else:
-           print("actioncards error")
+           self._log("actioncards error")
            return None
            
     def trigger_cardEffect(self):
         """Trigger the effect of the current action card."""
-        print(f"trigger_cardEffect executed for {self.state.current_action_key}")
+        if self.journal is not None:
+            self._record('effect')
+        self._log("trigger_cardEffect executed for %s", self.state.current_action_key)
         
         if self.state.current_action_key == "skip":
-            print("no effect triggered")
+            self._log("no effect triggered")
             return self.state.current_action_key
+        elif self.history is not None or EffectApplied in self.events.listening:
+            changes = []
+            result = self.card_manager.trigger_card_effect(
+                self.state.current_action_key,
+                self.state.action_paths,
+                changes
+            )
+            if self.history is not None:
+                self.history.record(changes)
+            if changes and EffectApplied in self.events.listening:
+                self.events.publish(EffectApplied(self.state.current_action_key,
+                                                  tuple((path, old, new) for _, path, old, new in changes)))
+            return result
         else:
             return self.card_manager.trigger_card_effect(
                 self.state.current_action_key, 
@@ -432,7 +679,7 @@ class ClassGameEngine:
 
     def trigger_storyEvent(self):
         """Trigger story events (placeholder for future implementation)."""
-        print("trigger_event executed")
+        self._log("trigger_event executed")
 
     # =============================================================================
     # GAME LOOP
@@ -440,17 +687,36 @@ class ClassGameEngine:
   
     def run_level_loop(self):
         """Main game loop for GUI compatibility"""
-        print("\nrun_level_loop executed")
-        print(f"round: {self.state.round_counter}")
+        if self.journal is not None:
+            self._record('loop')
+        self._log("run_level_loop executed")
+        self._log("round: %d", self.state.round_counter)
         self.trigger_storyEvent()
         
+        if self.history is not None:
+            tracked = self._track(('state', 'round_counter'), ('state', 'action_cards_played'),
+                                  ('state', 'current_action_key'))
+        
         if self.state.active_player_id % self.state.number_of_players == 0:
             self.state.increment_round()
+            if RoundIncremented in self.events.listening:
+                self.events.publish(RoundIncremented(self.state.round_counter))
         
         if self.state.action_cards_played >= 2:
-            self.nextPlayer()
+            previous_player_id = self.state.active_player_id
+            self._advance_player(publish=False)
             self.state.reset_turn()
-
+            # Published after reset_turn so handlers see the new player's fresh turn
+            if PlayerChanged in self.events.listening:
+                self.events.publish(PlayerChanged(previous_player_id, self.state.active_player_id))
+        
+        if self.history is not None:
+            self._record_tracked(tracked)
+        if self._metric_pending is not None:
+            name, start = self._metric_pending
+            self._metric_pending = None
+            if self.command_manager.metrics is not None:
+                self.command_manager.metrics.observe(name, time.perf_counter() - start)
         return self.state.status.value
 
     # =============================================================================
@@ -475,17 +741,130 @@ class ClassGameEngine:
         """
         command = self.command_manager.parse_input(command_name)
         if command:
+            if self.journal is not None:
+                self._record('command', name=command_name)
             context = self._build_command_context()
+            # PlayCardCommand only validates here, so it changes nothing to undo
+            if (self.history is not None and not isinstance(command, PlayCardCommand)
+                    and command.can_execute(context)):
+                self._begin_undo_step(command, context)
             context.update(kwargs)  # Add any additional kwargs to context
-            return self.command_manager.execute_command(command, context)
+            old_status = self.state.status
+            result = self.command_manager.execute_command(command, context)
+            if StatusChanged in self.events.listening:
+                self._publish_status_change(old_status)
+            return result
         return None
 
+    # =============================================================================
+    # HEADLESS SIMULATION
+    # =============================================================================
+
+    def play_input(self, user_input):
+        """
+        Run one input through the same pipeline the GUI uses:
+        process_user_input -> update_actioncards -> trigger_cardEffect -> run_level_loop
+
+        Returns:
+            bool: True if the input was accepted, False if it was rejected
+        """
+        if not self.process_user_input(user_input):
+            return False
+        if self.state.status == GameStatus.COMPLETED:
+            return True
+        if self.update_actioncards() is None:
+            return False
+        self.trigger_cardEffect()
+        self.run_level_loop()
+        return True
+
+    def run_headless_game(self, policy=None, num_players=2, max_rounds=100, target_progress=None):
+        """
+        Play a complete game without GUI, printing or file I/O.
+
+        There is no draw pile, so a game ends once every hand is empty (or after
+        max_rounds). The action paths are shared, so each player scores the path
+        progress their own cards produced. With target_progress set, the first
+        player whose score reaches it wins at once. Otherwise the highest score
+        at the end wins; equal scores go to the player who pushed one path
+        furthest, and a remaining tie has no winner. A hand holds 6 cards, so a
+        target above what one hand can produce is never reached.
+
+        Args:
+            policy: Callable (engine, player) -> input string; defaults to random_policy
+            num_players: Number of players (1-5)
+            max_rounds: Round limit after which the game ends
+            target_progress: Optional score that wins the game immediately
+
+        Returns:
+            dict: Game result (winner, scores, rounds, turns (player turns), moves (inputs played),
+                  action_paths, cards_remaining)
+        """
+        if policy is None:
+            policy = random_policy
+
+        self.initialize_game(num_players)
+        self._set_state('status', GameStatus.RUNNING)
+
+        state = self.state
+        players = self.players
+        scores = {p.player_id: 0 for p in players}
+        path_scores = {p.player_id: dict.fromkeys(state.action_paths, 0) for p in players}
+        winner = None
+        turns = 0
+        moves = 0
+
+        while state.status == GameStatus.RUNNING:
+            player = self.get_active_player()
+            if state.action_cards_played == 0:
+                turns += 1
+            paths_before = state.action_paths.copy()
+
+            # A rejected move forfeits the rest of the turn so bad policies can't stall the game
+            if not self.play_input(policy(self, player)):
+                self.play_input("skip")
+            moves += 1
+            player_paths = path_scores[player.player_id]
+            for path, value in state.action_paths.items():
+                player_paths[path] = player_paths.get(path, 0) + value - paths_before.get(path, 0)
+            scores[player.player_id] = sum(player_paths.values())
+
+            if target_progress is not None and scores[player.player_id] >= target_progress:
+                winner = player.player_id
+                self._set_state('status', GameStatus.COMPLETED)
+            elif state.round_counter > max_rounds or not any(p.get_total_cards() for p in players):
+                self._set_state('status', GameStatus.COMPLETED)
+
+        if winner is None:
+            ranking = {player_id: (scores[player_id], max(path_scores[player_id].values(), default=0))
+                       for player_id in scores}
+            best = max(ranking.values())
+            leaders = [player_id for player_id, rank in ranking.items() if rank == best]
+            winner = leaders[0] if len(leaders) == 1 else None
+
+        return {
+            'winner': winner,
+            'scores': scores,
+            'rounds': state.round_counter,
+            'turns': turns,
+            'moves': moves,
+            'action_paths': state.action_paths.copy(),
+            'cards_remaining': {f"player {p.player_id}": p.get_total_cards() for p in players}
+        }
+
     # =============================================================================
     # DATA PERSISTENCE
     # =============================================================================
     
     def save_player_data(self):
-        """Save player data to JSON file"""
+        """
+        Save player data to JSON file
+        
+        With write-behind persistence the data is queued and written in the background.
+        
+        Returns:
+            dict or None: The saved data, or None if saving failed
+        """
         try:
             # Include game state in the save
             save_data = {
@@ -493,11 +872,23 @@ class ClassGameEngine:
                 'players': self.get_player_data()
             }
             
-            with open("playerdata.json", "w") as json_file:
+            if self._save_writer:
+                self._save_writer.submit(save_data)
+                return save_data
+            
+            with open(self.save_file, "w") as json_file:
                 json.dump(save_data, json_file, indent=4)
-            print("Player information saved to 'playerdata.json'.")
+            logger.info("Player information saved to '%s'.", self.save_file)
+            return save_data
         except Exception as e:
-            print(f"Warning: Could not save to file: {e}")
+            logger.warning("Could not save to file: %s", e)
+            return None
+    
+    def flush(self):
+        """Write any pending write-behind save to disk (call before shutdown)"""
+        if self._save_writer:
+            return self._save_writer.flush()
+        return True
     
     def get_player_data(self):
         """Get player data in dictionary format"""
@@ -510,36 +901,39 @@ class ClassGameEngine:
     def load_and_display_player_data(self):
         """Load and display player data"""
         try:
-            if os.path.exists("playerdata.json"):
-                with open("playerdata.json", "r") as json_file:
+            if os.path.exists(self.save_file):
+                with open(self.save_file, "r") as json_file:
                     data = json.load(json_file)
-                    
-                    # Display game state if present
-                    if 'game_state' in data:
-                        print("Game State:", data['game_state'])
-                    
-                    # Display player data
-                    if 'players' in data:
-                        for key, value in data['players'].items():
-                            print(key, value)
-                    else:
-                        # Legacy format support
-                        for key, value in data.items():
-                            if key != 'game_state':
-                                print(key, value)
+                self._display_save_data(data)
         except Exception as e:
-            print(f"Warning: File operation failed: {e}")
+            logger.warning("File operation failed: %s", e)
+    
+    def _display_save_data(self, data):
+        """Log game state and player data from a save dictionary"""
+        # Display game state if present
+        if 'game_state' in data:
+            logger.info("Game State: %s", data['game_state'])
+        
+        # Display player data
+        if 'players' in data:
+            for key, value in data['players'].items():
+                logger.info("%s %s", key, value)
+        else:
+            # Legacy format support
+            for key, value in data.items():
+                if key != 'game_state':
+                    logger.info("%s %s", key, value)
     
     def load_player_data_from_file(self):
         """Load player data from JSON file and recreate Player objects"""
         try:
-            if os.path.exists("playerdata.json"):
-                with open("playerdata.json", "r") as json_file:
+            if os.path.exists(self.save_file):
+                with open(self.save_file, "r") as json_file:
                     data = json.load(json_file)
                     
                     # Load game state if present
                     if 'game_state' in data:
-                        self.state = GameState.from_dict(data['game_state'])
+                        self.state = self.state_class.from_dict(data['game_state'])
                     
                     # Determine where player data is stored
                     player_data = data.get('players', data)
@@ -548,16 +942,22 @@ class ClassGameEngine:
                     self.players = []
                     for key, player_dict in player_data.items():
                         if key != 'game_state':  # Skip non-player entries
-                            player = Player.from_dict(player_dict, self.card_manager)
+                            player = self.player_class.from_dict(player_dict, self.card_manager)
                             self.players.append(player)
                             if player.is_active:
                                 self.state.active_player_id = player.player_id
                     
                     self.state.number_of_players = len(self.players)
-                    print("Player data loaded successfully from file.")
+                    if self.journal is not None:
+                        self._record('snapshot', snapshot=self._journal_snapshot())
+                    if self.history is not None:
+                        self.history.clear()
+                    if StateRestored in self.events.listening:
+                        self.events.publish(StateRestored('load'))
+                    logger.info("Player data loaded successfully from file.")
                     return True
         except Exception as e:
-            print(f"Warning: Could not load player data: {e}")
+            logger.warning("Could not load player data: %s", e)
             return False
 
     # =============================================================================
@@ -580,7 +980,66 @@ class ClassGameEngine:
     def add_custom_card(self, name, keywords, effect=None, category="custom"):
         """Add a custom card to the game"""
         self.card_manager.add_card(name, keywords, effect, category)
-        # Update legacy properties
+        self._refresh_legacy_card_properties()
+    
+    def add_custom_cards(self, card_definitions):
+        """
+        Add many custom cards at once (e.g. an expansion deck)
+        
+        Args:
+            card_definitions: Iterable of (name, keywords[, effect[, category]]) tuples;
+                              category defaults to "custom"
+        """
+        self.card_manager.add_cards(card_definitions, category="custom")
+        self._refresh_legacy_card_properties()
+    
+    def _refresh_legacy_card_properties(self):
+        """Update legacy properties derived from the card set"""
         self.actionDictionary = self.card_manager.get_legacy_action_dictionary()
         self.possibleActionKeys_tuple = self.card_manager.get_all_card_names()
-        self.possibleActionValues_tuple = self.card_manager.get_all_keywords()
\ No newline at end of file
+        self.possibleActionValues_tuple = self.card_manager.get_all_keywords()
+
+# =============================================================================
+# HEADLESS SIMULATION HELPERS
+# =============================================================================
+
+def random_policy(engine, player):
+    """Default policy: play a random card from the hand, skip when the hand is empty"""
+    playable = player.get_playable_cards()
+    if not playable:
+        return "skip"
+    card = engine.card_manager.get_card(engine.rng.choice(playable))
+    return card.keywords[0]
+
+
+def simulate_games(num_games, seed=0, policy=None, **game_kwargs):
+    """
+    Play num_games headless games with seeds seed, seed+1, ...
+    
+    Args:
+        num_games: Number of games to play
+        seed: Seed of the first game
+        policy: Callable (engine, player) -> input string
+        **game_kwargs: Passed on to ClassGameEngine.run_headless_game
+        
+    Returns:
+        dict: Per-game results plus throughput (games_per_second, turns_per_second)
+    """
+    results = []
+    start = time.perf_counter()
+    
+    for game_seed in range(seed, seed + num_games):
+        engine = ClassGameEngine(headless=True, seed=game_seed)
+        result = engine.run_headless_game(policy, **game_kwargs)
+        result['seed'] = game_seed
+        results.append(result)
+    
+    elapsed = time.perf_counter() - start
+    total_turns = sum(result['turns'] for result in results)
+    return {
+        'games': num_games,
+        'elapsed': elapsed,
+        'games_per_second': num_games / elapsed if elapsed > 0 else 0.0,
+        'turns_per_second': total_turns / elapsed if elapsed > 0 else 0.0,
+        'results': results
+    }
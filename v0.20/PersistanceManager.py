@@ -1,16 +1,318 @@
 import json
+import logging
 import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
+from serializers import SaveSerializer, JsonSerializer, encode_save, decode_save
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write_json(filepath, data: Any, indent: Optional[int] = None) -> None:
+    """Write JSON to a temp file in the target directory, then rename it over filepath"""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+class WriteBehindWriter:
+    """
+    Coalesces rapid saves into at most one atomic write per interval.
+    
+    submit() only stores the latest data and returns immediately; a daemon thread
+    writes it in the background. Call flush() (or close()) before shutdown so the
+    last submitted state reaches the disk.
+    """
+    
+    def __init__(self, filepath, interval: float = 1.0, indent: Optional[int] = 4):
+        self.filepath = filepath
+        self.interval = interval
+        self.indent = indent
+        self.writes = 0
+        
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="WriteBehindWriter", daemon=True)
+        self._thread.start()
+    
+    def submit(self, data: Dict[str, Any]) -> None:
+        """Queue data for writing, replacing any data not yet written"""
+        with self._condition:
+            self._pending = data
+            self._condition.notify()
+    
+    def flush(self) -> bool:
+        """Write any pending data now on the calling thread"""
+        with self._write_lock:
+            with self._condition:
+                data, self._pending = self._pending, None
+            if data is None:
+                return True
+            return self._write(data)
+    
+    def close(self) -> None:
+        """Flush pending data and stop the background thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+    
+    def _write(self, data: Dict[str, Any]) -> bool:
+        """Atomically write data to the target file"""
+        try:
+            atomic_write_json(self.filepath, data, indent=self.indent)
+            self.writes += 1
+            return True
+        except Exception as e:
+            logger.warning("Write-behind save to '%s' failed: %s", self.filepath, e)
+            return False
+    
+    def _run(self) -> None:
+        """Background loop: write the latest data, then wait out the interval"""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            
+            self.flush()
+            
+            # Saves submitted during the interval are coalesced into the next write
+            deadline = time.monotonic() + self.interval
+            with self._condition:
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+class SaveIndex:
+    """
+    SQLite sidecar index of save file metadata.
+    
+    Listing saves reads only this index instead of opening every save file.
+    One connection is opened on first use and kept; it is reopened (and the
+    index rebuilt) only if the index file disappears or turns out corrupted.
+    """
+    
+    INDEX_FILENAME = ".save_index.sqlite"
+    SCHEMA_VERSION = 2
+    
+    def __init__(self, save_directory: Path, scan_saves):
+        """
+        Args:
+            save_directory: Directory holding the save files
+            scan_saves: Callable returning metadata entries for all save files (used to rebuild)
+        """
+        self.path = save_directory / self.INDEX_FILENAME
+        self._scan_saves = scan_saves
+        self._connection = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the index, rebuilding it first if the file is missing or outdated"""
+        missing = not self.path.exists()
+        # The lock in _run serializes access, so the connection may be shared between threads
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            # The index can always be rebuilt from the saves, so skip fsync on every update
+            connection.execute("PRAGMA synchronous = OFF")
+            
+            outdated = connection.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION
+            if outdated:
+                connection.execute("DROP TABLE IF EXISTS saves")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS saves ("
+                "filename TEXT PRIMARY KEY, timestamp TEXT, version TEXT, players INTEGER, bytes INTEGER)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS saves_by_time ON saves (timestamp)")
+            if missing or outdated:
+                self._fill(connection)
+                connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        except BaseException:
+            # Close before the caller deletes the file (an open handle blocks unlink on Windows)
+            connection.close()
+            raise
+        return connection
+    
+    def _fill(self, connection: sqlite3.Connection) -> None:
+        """Replace the index contents with a fresh scan of the save files"""
+        with connection:
+            connection.execute("DELETE FROM saves")
+            connection.executemany(
+                "INSERT OR REPLACE INTO saves VALUES (:filename, :timestamp, :version, :players, :bytes)",
+                self._scan_saves()
+            )
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """The open connection, reconnecting if there is none or the index file was deleted"""
+        if self._connection is not None and not self.path.exists():
+            self._close_connection()
+        if self._connection is None:
+            self._connection = self._connect()
+        return self._connection
+    
+    def _close_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+    
+    def _run(self, operation):
+        """Run operation(connection); a corrupted index is deleted, rebuilt and retried once"""
+        with self._lock:
+            try:
+                return operation(self._get_connection())
+            except sqlite3.DatabaseError as e:
+                logger.warning("Save index '%s' unusable (%s), rebuilding", self.path, e)
+                self._close_connection()
+                self.path.unlink(missing_ok=True)
+                return operation(self._get_connection())
+    
+    def close(self) -> None:
+        """Close the index connection (the next operation reopens it)"""
+        with self._lock:
+            self._close_connection()
+    
+    def upsert(self, entry: Dict[str, Any]) -> None:
+        """Add or update the metadata of one save file"""
+        def operation(connection):
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO saves VALUES (:filename, :timestamp, :version, :players, :bytes)",
+                    entry
+                )
+        self._run(operation)
+    
+    def remove(self, filename: str) -> None:
+        """Drop a save file from the index"""
+        def operation(connection):
+            with connection:
+                connection.execute("DELETE FROM saves WHERE filename = ?", (filename,))
+        self._run(operation)
+    
+    def list(self, offset: int = 0, limit: Optional[int] = None, newest_first: bool = True,
+             prefix: str = "", include_size: bool = False) -> List[Dict[str, Any]]:
+        """Return one page of save metadata sorted by timestamp, optionally only filenames starting with prefix"""
+        order = "DESC" if newest_first else "ASC"
+        query = (f"SELECT filename, timestamp, version, players, bytes FROM saves "
+                 f"WHERE substr(filename, 1, ?) = ? "
+                 f"ORDER BY timestamp {order}, filename {order} LIMIT ? OFFSET ?")
+        
+        def operation(connection):
+            rows = connection.execute(query, (len(prefix), prefix, -1 if limit is None else limit, offset)).fetchall()
+            saves = []
+            for filename, timestamp, version, players, size in rows:
+                entry = {'filename': filename, 'timestamp': timestamp, 'version': version, 'players': players}
+                if include_size:
+                    entry['bytes'] = size
+                saves.append(entry)
+            return saves
+        return self._run(operation)
+    
+    def count(self) -> int:
+        """Number of indexed save files"""
+        return self._run(lambda connection: connection.execute("SELECT COUNT(*) FROM saves").fetchone()[0])
+    
+    def rebuild(self) -> None:
+        """Rebuild the index from the save files"""
+        self._run(self._fill)
+
+@dataclass
+class AutosaveRetention:
+    """
+    Which autosaves to keep. An autosave survives if any keep rule selects it,
+    then the newest survivors are kept up to max_total_bytes.
+    """
+    
+    keep_last: Optional[int] = 10           # newest N autosaves (None: keep all)
+    keep_daily: int = 0                     # additionally the newest autosave of each of the last N days
+    max_total_bytes: Optional[int] = None   # byte budget for all kept autosaves (newest always kept)
+    
+    def select_expired(self, autosaves: List[Dict[str, Any]]) -> List[str]:
+        """
+        Args:
+            autosaves: Autosave entries with 'filename', 'timestamp' and 'bytes', newest first
+            
+        Returns:
+            Filenames of autosaves to delete
+        """
+        kept = set()
+        if self.keep_last is None:
+            kept.update(save['filename'] for save in autosaves)
+        else:
+            kept.update(save['filename'] for save in autosaves[:self.keep_last])
+        
+        days_seen = set()
+        for save in autosaves:
+            day = save['timestamp'][:10]
+            if day not in days_seen and len(days_seen) < self.keep_daily:
+                days_seen.add(day)
+                kept.add(save['filename'])
+        
+        if self.max_total_bytes is not None:
+            total = 0
+            for position, save in enumerate(save for save in autosaves if save['filename'] in kept):
+                total += save['bytes'] or 0
+                if total > self.max_total_bytes and position > 0:
+                    kept.discard(save['filename'])
+        
+        return [save['filename'] for save in autosaves if save['filename'] not in kept]
 
 class PersistenceManager:
     """Handles all game data persistence operations"""
     
-    def __init__(self, save_directory: str = "saves"):
+    AUTOSAVE_PREFIX = "autosave_"
+    
+    def __init__(self, save_directory: str = "saves", serializer: Optional[SaveSerializer] = None,
+                 compression: Optional[str] = None):
+        """
+        Args:
+            save_directory: Directory holding the save files
+            serializer: Save codec (default: pretty-printed JSON, the legacy format)
+            compression: None, 'zlib' or 'lzma'
+        
+        Loading always detects the format, so saves written with any codec can be read.
+        """
         self.save_directory = Path(save_directory)
         self.save_directory.mkdir(exist_ok=True)
         self.current_save_file = "playerdata.json"
+        self.serializer = serializer if serializer else JsonSerializer(indent=4)
+        self.compression = compression
+        self.index = SaveIndex(self.save_directory, self._scan_save_metadata)
+    
+    @property
+    def file_extension(self) -> str:
+        """Extension for new save files: .json for plain JSON, .sav for headered formats"""
+        if self.compression is None and isinstance(self.serializer, JsonSerializer):
+            return ".json"
+        return ".sav"
+    
+    def _write_save_file(self, filepath, data: Dict[str, Any]) -> None:
+        """Encode data with the configured format and write it to filepath"""
+        with open(filepath, 'wb') as f:
+            f.write(encode_save(data, self.serializer, self.compression))
+    
+    def _read_save_file(self, filepath) -> Dict[str, Any]:
+        """Read and decode a save file in any supported format"""
+        with open(filepath, 'rb') as f:
+            return decode_save(f.read())
     
     def save_game_state(self, game_data: Dict[str, Any], filename: Optional[str] = None) -> bool:
         """
@@ -41,14 +343,14 @@ class PersistenceManager:
                 'settings': game_data.get('settings', {})
             }
             
-            with open(filepath, 'w') as f:
-                json.dump(save_data, f, indent=4)
+            self._write_save_file(filepath, save_data)
+            self.index.upsert(self._save_metadata(filepath, save_data))
             
-            print(f"Game state saved to '{filepath}'")
+            logger.info("Game state saved to '%s'", filepath)
             return True
             
         except Exception as e:
-            print(f"Error saving game state: {e}")
+            logger.error("Error saving game state: %s", e)
             return False
     
     def load_game_state(self, filename: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -68,22 +370,21 @@ class PersistenceManager:
         
         try:
             if not filepath.exists():
-                print(f"Save file '{filepath}' not found")
+                logger.warning("Save file '%s' not found", filepath)
                 return None
             
-            with open(filepath, 'r') as f:
-                save_data = json.load(f)
+            save_data = self._read_save_file(filepath)
             
             # Validate save data structure
             if not self._validate_save_data(save_data):
-                print("Invalid save file format")
+                logger.warning("Invalid save file format")
                 return None
             
-            print(f"Game state loaded from '{filepath}'")
+            logger.info("Game state loaded from '%s'", filepath)
             return save_data
             
         except Exception as e:
-            print(f"Error loading game state: {e}")
+            logger.error("Error loading game state: %s", e)
             return None
     
     def _validate_save_data(self, save_data: Dict) -> bool:
@@ -94,34 +395,74 @@ class PersistenceManager:
     def create_autosave(self, game_data: Dict[str, Any]) -> bool:
         """Create an autosave with timestamp"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"autosave_{timestamp}.json"
+        filename = f"{self.AUTOSAVE_PREFIX}{timestamp}{self.file_extension}"
         return self.save_game_state(game_data, filename)
     
-    def list_save_files(self) -> List[Dict[str, Any]]:
+    def apply_autosave_retention(self, retention: 'AutosaveRetention') -> List[str]:
+        """
+        Delete autosaves that the retention policy no longer keeps
+        
+        Returns:
+            List of deleted filenames
+        """
+        autosaves = self.index.list(prefix=self.AUTOSAVE_PREFIX, include_size=True)
+        expired = retention.select_expired(autosaves)
+        for filename in expired:
+            self.delete_save(filename)
+        return expired
+    
+    def list_save_files(self, offset: int = 0, limit: Optional[int] = None,
+                        newest_first: bool = True) -> List[Dict[str, Any]]:
         """
-        List all available save files with metadata
+        List available save files with metadata, read from the save index
         
+        Args:
+            offset: Number of saves to skip (for pagination)
+            limit: Maximum number of saves to return (default: all)
+            newest_first: Sort by timestamp descending (default) or ascending
+            
         Returns:
             List of save file information
         """
+        return self.index.list(offset, limit, newest_first)
+    
+    def count_save_files(self) -> int:
+        """Number of save files in the index"""
+        return self.index.count()
+    
+    def rebuild_index(self) -> None:
+        """Rebuild the save index, e.g. after save files were copied in by hand"""
+        self.index.rebuild()
+    
+    def close(self) -> None:
+        """Release the save index connection"""
+        self.index.close()
+    
+    @staticmethod
+    def _save_metadata(filepath: Path, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the listing metadata of one save"""
+        return {
+            'filename': filepath.name,
+            'timestamp': data.get('metadata', {}).get('timestamp', 'Unknown'),
+            'version': data.get('metadata', {}).get('version', 'Unknown'),
+            'players': len(data.get('players', {})),
+            'bytes': filepath.stat().st_size
+        }
+    
+    def _scan_save_metadata(self) -> List[Dict[str, Any]]:
+        """Read the metadata of every save file in the directory (slow; used to rebuild the index)"""
         saves = []
         
-        for filepath in self.save_directory.glob("*.json"):
+        filepaths = list(self.save_directory.glob("*.json")) + list(self.save_directory.glob("*.sav"))
+        for filepath in filepaths:
             try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                    
-                saves.append({
-                    'filename': filepath.name,
-                    'timestamp': data.get('metadata', {}).get('timestamp', 'Unknown'),
-                    'version': data.get('metadata', {}).get('version', 'Unknown'),
-                    'players': len(data.get('players', {}))
-                })
+                data = self._read_save_file(filepath)
+                saves.append(self._save_metadata(filepath, data))
             except:
                 # Skip invalid files
                 continue
         
-        return sorted(saves, key=lambda x: x['timestamp'], reverse=True)
+        return saves
     
     def delete_save(self, filename: str) -> bool:
         """Delete a save file"""
@@ -130,49 +471,53 @@ class PersistenceManager:
         try:
             if filepath.exists():
                 filepath.unlink()
-                print(f"Save file '{filename}' deleted")
+                self.index.remove(filename)
+                logger.info("Save file '%s' deleted", filename)
                 return True
             else:
-                print(f"Save file '{filename}' not found")
+                logger.warning("Save file '%s' not found", filename)
                 return False
         except Exception as e:
-            print(f"Error deleting save file: {e}")
+            logger.error("Error deleting save file: %s", e)
             return False
     
     def export_game_data(self, game_data: Dict[str, Any], export_path: str) -> bool:
         """Export game data to external location"""
         try:
-            with open(export_path, 'w') as f:
-                json.dump(game_data, f, indent=4)
-            print(f"Game data exported to '{export_path}'")
+            self._write_save_file(export_path, game_data)
+            logger.info("Game data exported to '%s'", export_path)
             return True
         except Exception as e:
-            print(f"Error exporting game data: {e}")
+            logger.error("Error exporting game data: %s", e)
             return False
     
     def import_game_data(self, import_path: str) -> Optional[Dict[str, Any]]:
         """Import game data from external location"""
         try:
-            with open(import_path, 'r') as f:
-                data = json.load(f)
+            data = self._read_save_file(import_path)
             
             if self._validate_save_data(data):
-                print(f"Game data imported from '{import_path}'")
+                logger.info("Game data imported from '%s'", import_path)
                 return data
             else:
-                print("Invalid import file format")
+                logger.warning("Invalid import file format")
                 return None
         except Exception as e:
-            print(f"Error importing game data: {e}")
+            logger.error("Error importing game data: %s", e)
             return None
 
 class SaveManager:
     """High-level save management interface"""
     
-    def __init__(self, persistence_manager: PersistenceManager):
+    def __init__(self, persistence_manager: PersistenceManager, retention: Optional[AutosaveRetention] = None):
         self.persistence = persistence_manager
         self.autosave_enabled = True
         self.autosave_interval = 5  # rounds
+        self.retention = retention if retention else AutosaveRetention()
+        
+        # De-duplication: a round is autosaved at most once, and unchanged games not at all
+        self._last_autosave_round = None
+        self._last_autosave_fingerprint = None
     
     def save_game(self, game_engine) -> bool:
         """Save complete game state from engine"""
@@ -210,15 +555,37 @@ class SaveManager:
             return True
         return False
     
-    def check_autosave(self, game_engine) -> None:
-        """Check if autosave should be triggered"""
-        if self.autosave_enabled:
-            if game_engine.state.round_counter % self.autosave_interval == 0:
-                self.persistence.create_autosave({
-                    'game_state': game_engine.state.to_dict(),
-                    'players': game_engine.get_player_data(),
-                    'settings': {
-                        'autosave_enabled': self.autosave_enabled,
-                        'autosave_interval': self.autosave_interval
-                    }
-                })
\ No newline at end of file
+    def check_autosave(self, game_engine) -> bool:
+        """
+        Check if autosave should be triggered and enforce the retention policy
+        
+        Returns:
+            bool: True if an autosave was written
+        """
+        if not self.autosave_enabled:
+            return False
+        
+        round_counter = game_engine.state.round_counter
+        if round_counter % self.autosave_interval != 0 or round_counter == self._last_autosave_round:
+            return False
+        
+        game_data = {
+            'game_state': game_engine.state.to_dict(),
+            'players': game_engine.get_player_data(),
+            'settings': {
+                'autosave_enabled': self.autosave_enabled,
+                'autosave_interval': self.autosave_interval
+            }
+        }
+        fingerprint = json.dumps(game_data, sort_keys=True)
+        if fingerprint == self._last_autosave_fingerprint:
+            self._last_autosave_round = round_counter
+            return False
+        
+        # A failed autosave leaves the round unmarked so the next call retries it
+        if not self.persistence.create_autosave(game_data):
+            return False
+        self._last_autosave_round = round_counter
+        self._last_autosave_fingerprint = fingerprint
+        self.persistence.apply_autosave_retention(self.retention)
+        return True
\ No newline at end of file
@@ -1,5 +1,20 @@
 from itertools import chain
+from collections import Counter
+from contextlib import contextmanager
+import logging
 import random
+from gamestate import bump_version
+
+logger = logging.getLogger(__name__)
+
+
+def _import_numpy(feature):
+    """Import numpy on first use, so only array-backed hands pay for it"""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(f"{feature} requires numpy") from None
+    return numpy
 
 class ActionCard:
     """
@@ -38,11 +53,16 @@ class ActionCardManager:
     Manages all action cards, their definitions, and related operations
     """
     
-    def __init__(self):
+    def __init__(self, rng=None, verbose=True):
         self.cards = {}  # name -> ActionCard
+        self.rng = rng if rng is not None else random  # anything with .choice()
+        self.verbose = verbose
         self.shortcut_mapping = {}
+        self._name_index = {}     # case-folded name -> card name
+        self._keyword_index = {}  # case-folded keyword -> card name (first card wins)
+        self._input_index = {}    # case-folded keyword -> card name the input resolves to
+        self._bulk_depth = 0      # > 0 while inside bulk_update()
         self._initialize_default_cards()
-        self._build_shortcut_mapping()
     
     def _initialize_default_cards(self):
         """Initialize the default card set"""
@@ -62,22 +82,83 @@ class ActionCardManager:
             ("2x joker", ["double joker"], {}, "special")
         ]
         
-        for name, keywords, effect, category in card_definitions:
-            self.add_card(name, keywords, effect, category)
+        self.add_cards(card_definitions)
     
     def _build_shortcut_mapping(self):
-        """Build mapping from shortcuts to full card names"""
+        """Build mapping from shortcuts to full card names, plus the keyword lookup indexes"""
         self.shortcut_mapping = {}
+        self._name_index = {}
+        self._keyword_index = {}
         for card_name, card in self.cards.items():
+            self._name_index.setdefault(card_name.casefold(), card_name)
             for keyword in card.keywords:
+                folded = keyword.casefold()
+                self._keyword_index.setdefault(folded, card_name)
                 if keyword != card_name:  # Don't map full name to itself
-                    self.shortcut_mapping[keyword.lower()] = card_name
+                    self.shortcut_mapping[folded] = card_name
+        
+        # Precompute what every valid keyword resolves to (shortcuts win over names)
+        self._input_index = {
+            folded: self.shortcut_mapping.get(folded) or self._name_index.get(folded)
+            for folded in self._keyword_index
+        }
+    
+    def _index_card(self, card):
+        """Add a newly registered card to the shortcut mapping and lookup indexes"""
+        folded_name = card.name.casefold()
+        self._name_index.setdefault(folded_name, card.name)
+        
+        touched = [folded_name]
+        for keyword in card.keywords:
+            folded = keyword.casefold()
+            self._keyword_index.setdefault(folded, card.name)
+            if keyword != card.name:  # Don't map full name to itself
+                self.shortcut_mapping[folded] = card.name
+            touched.append(folded)
+        
+        # Only keywords sharing a spelling with this card can resolve differently now
+        for folded in touched:
+            if folded in self._keyword_index:
+                self._input_index[folded] = self.shortcut_mapping.get(folded) or self._name_index.get(folded)
     
     def add_card(self, name, keywords, effect=None, category="basic"):
         """Add a new card to the manager"""
         card = ActionCard(name, keywords, effect, category)
+        replacing = name in self.cards
         self.cards[name] = card
-        self._build_shortcut_mapping()  # Rebuild shortcuts
+        self._card_index = None
+        
+        if self._bulk_depth:
+            return  # Indexes are rebuilt once when the bulk update ends
+        if replacing:
+            self._build_shortcut_mapping()  # Old keywords must be dropped
+        else:
+            self._index_card(card)
+    
+    def add_cards(self, card_definitions, category="basic"):
+        """
+        Add many cards, rebuilding the shortcut mapping once for the whole batch
+        
+        Args:
+            card_definitions: Iterable of (name, keywords[, effect[, category]]) tuples
+            category: Category for definitions that don't name one (default: "basic")
+        """
+        with self.bulk_update():
+            for name, keywords, *rest in card_definitions:
+                effect = rest[0] if rest else None
+                card_category = rest[1] if len(rest) > 1 else category
+                self.add_card(name, keywords, effect, card_category)
+    
+    @contextmanager
+    def bulk_update(self):
+        """Defer shortcut mapping maintenance while registering many cards"""
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if self._bulk_depth == 0:
+                self._build_shortcut_mapping()
     
     def get_card(self, name):
         """Get card by name"""
@@ -85,34 +166,27 @@ class ActionCardManager:
     
     def get_card_by_keyword(self, keyword):
         """Get card by any of its keywords"""
-        keyword_lower = keyword.lower()
-        
-        # First check direct name match
-        for card_name, card in self.cards.items():
-            if card_name.lower() == keyword_lower:
-                return card
+        folded = keyword.casefold()
         
-        # Then check keyword matches
-        for card in self.cards.values():
-            if card.matches_keyword(keyword):
-                return card
-        
-        return None
+        # First check direct name match, then keyword matches
+        card_name = self._name_index.get(folded) or self._keyword_index.get(folded)
+        return self.cards[card_name] if card_name else None
     
     def resolve_input_to_card_name(self, user_input):
         """Convert user input (including shortcuts) to full card name"""
-        user_input_lower = user_input.lower()
+        folded = user_input.casefold()
         
-        # Check shortcuts first
-        if user_input_lower in self.shortcut_mapping:
-            return self.shortcut_mapping[user_input_lower]
-        
-        # Check direct name match
-        for card_name in self.cards.keys():
-            if card_name.lower() == user_input_lower:
-                return card_name
+        # Check shortcuts first, then direct name match
+        return self.shortcut_mapping.get(folded) or self._name_index.get(folded)
+    
+    def resolve_keyword(self, user_input):
+        """
+        Validate and resolve user input in a single lookup
         
-        return None
+        Returns:
+            str or None: Card name if the input is a valid keyword, otherwise None
+        """
+        return self._input_index.get(user_input.casefold())
     
     def get_all_card_names(self):
         """Get all card names as tuple"""
@@ -142,14 +216,51 @@ class ActionCardManager:
         if card_pool is None:
             card_pool = self.get_basic_cards()
         
-        dealt_cards = [random.choice(card_pool) for _ in range(num_cards)]
-        dealt_cards.sort()
-        
-        # Count occurrences
-        card_counts = {card_name: dealt_cards.count(card_name) for card_name in card_pool}
+        # Count occurrences in a single pass
+        dealt_counts = Counter(self.rng.choice(card_pool) for _ in range(num_cards))
+        card_counts = {card_name: dealt_counts[card_name] for card_name in card_pool}
         
         return card_counts
     
+    def get_card_index(self):
+        """
+        Get the fixed integer index of every card name
+        
+        Indices follow registration order, so adding cards never renumbers existing ones.
+        """
+        if self._card_index is None:
+            self._card_index = {name: index for index, name in enumerate(self.cards)}
+        return self._card_index
+    
+    def deal_card_table(self, num_games, num_players, num_cards=6, card_pool=None, seed=None):
+        """
+        Deal hands for many games at once with a multinomial draw (requires numpy)
+        
+        Args:
+            num_games: Number of games to deal for
+            num_players: Number of players per game
+            num_cards: Cards per hand (default: 6)
+            card_pool: Card names to draw from (default: basic cards)
+            seed: Seed or numpy Generator
+            
+        Returns:
+            numpy.ndarray: Card counts of shape (num_games, num_players, number of cards),
+            indexed by get_card_index()
+        """
+        np = _import_numpy("deal_card_table")
+        if card_pool is None:
+            card_pool = self.get_basic_cards()
+        
+        card_index = self.get_card_index()
+        probabilities = np.zeros(len(card_index))
+        for card_name in card_pool:
+            probabilities[card_index[card_name]] += 1
+        probabilities /= probabilities.sum()
+        
+        rng = np.random.default_rng(seed)
+        table = rng.multinomial(num_cards, probabilities, size=(num_games, num_players))
+        return table.astype(np.int32)
+    
     def get_legacy_action_dictionary(self):
         """Convert to legacy format for backward compatibility"""
         legacy_dict = {}
@@ -165,18 +276,29 @@ class ActionCardManager:
     
     def validate_input(self, user_input):
         """Check if user input is valid"""
-        return user_input.lower() in [k.lower() for k in self.get_all_keywords()]
+        return user_input.casefold() in self._keyword_index
     
-    def trigger_card_effect(self, card_name, action_paths):
-        """Apply card effect to action paths"""
+    def trigger_card_effect(self, card_name, action_paths, changes=None):
+        """
+        Apply card effect to action paths
+        
+        Args:
+            card_name: Name of the card whose effect is applied
+            action_paths: Action path dictionary updated in place
+            changes: Optional list receiving ('path', key, old, new) tuples for undo
+        """
         card = self.get_card(card_name)
         if not card or not card.has_effect():
-            print("no effect triggered")
+            if self.verbose:
+                logger.debug("no effect triggered")
             return card_name
         
         # Apply effect to action paths
         for effect_key, effect_value in card.effect.items():
             if effect_key in action_paths:
+                if changes is not None:
+                    old_value = action_paths[effect_key]
+                    changes.append(('path', effect_key, old_value, old_value + effect_value))
                 action_paths[effect_key] += effect_value
         
         return action_paths
@@ -188,4 +310,81 @@ class ActionCardManager:
         return iter(self.cards.values())
     
     def __contains__(self, card_name):
-        return card_name in self.cards
\ No newline at end of file
+        return card_name in self.cards
+
+
+class ArrayHand:
+    """
+    Player hand stored as an int array of card counts (requires numpy)
+    
+    Behaves like the actioncards dict, but counts live in an array indexed by
+    ActionCardManager.get_card_index(). The array can be a row view into a
+    table from ActionCardManager.deal_card_table, so no counts are copied.
+    """
+    
+    def __init__(self, card_index, counts=None):
+        if counts is None:
+            np = _import_numpy("ArrayHand")
+            counts = np.zeros(len(card_index), dtype=np.int32)
+        self.card_index = card_index
+        self.card_names = tuple(card_index)
+        self.counts = counts
+        self.owner = None  # object whose version is bumped on writes (see gamestate.bump_version)
+    
+    def __getitem__(self, card_name):
+        return int(self.counts[self.card_index[card_name]])
+    
+    def __setitem__(self, card_name, count):
+        self.counts[self.card_index[card_name]] = count
+        if self.owner is not None:
+            bump_version(self.owner)
+    
+    def extend(self, card_index):
+        """
+        Switch to a larger card index after cards were added to the manager
+        
+        Existing cards keep their indices, so the counts are copied and padded
+        with zeros (a hand viewing a deal_card_table row gets its own array).
+        """
+        if len(card_index) <= len(self.counts):
+            return
+        counts = self.counts
+        self.counts = _import_numpy("ArrayHand").zeros(len(card_index), dtype=counts.dtype)
+        self.counts[:len(counts)] = counts
+        self.card_index = card_index
+        self.card_names = tuple(card_index)
+        if self.owner is not None:
+            bump_version(self.owner)
+    
+    def get(self, card_name, default=None):
+        index = self.card_index.get(card_name)
+        return default if index is None else int(self.counts[index])
+    
+    def keys(self):
+        return list(self.card_names)
+    
+    def values(self):
+        return self.counts.tolist()
+    
+    def items(self):
+        return list(zip(self.card_names, self.counts.tolist()))
+    
+    def copy(self):
+        """Return a plain dict copy (used for saving)"""
+        return dict(self.items())
+    
+    def total(self):
+        """Total number of cards in the hand"""
+        return int(self.counts.sum())
+    
+    def __contains__(self, card_name):
+        return card_name in self.card_index
+    
+    def __iter__(self):
+        return iter(self.card_names)
+    
+    def __len__(self):
+        return len(self.card_names)
+    
+    def __repr__(self):
+        return f"ArrayHand({self.copy()})"
\ No newline at end of file
@@ -0,0 +1,601 @@
+"""
+Benchmarks for the v0.20 hot paths.
+
+The suite (SUITE) times single operations: command parsing, dealing, playing
+a card, a full engine turn, saving and loading player data, listing 10k save
+files and one game screen frame under the SDL dummy video driver. The studies
+(bench_* functions) compare implementation alternatives side by side.
+
+Run from the v0.20 directory:
+    python benchmarks.py                          # run the suite and print it
+    python benchmarks.py --json results.json      # ... and store the results
+    python benchmarks.py --compare baseline.json  # ... and fail on regressions
+    python benchmarks.py --studies                # also run the comparison studies
+
+With pytest-benchmark installed the suite also runs under pytest:
+    pytest benchmarks.py --benchmark-json=results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime
+from actioncard import ActionCardManager
+from commands import CommandManager
+from GameEngine import ClassGameEngine
+from history import UndoHistory
+from PersistanceManager import PersistenceManager
+from player import Player
+from serializers import JsonSerializer, BinarySerializer, encode_save, decode_save
+
+
+def _best_time(func, repeat=3):
+    """Run func repeat times and return the fastest wall-clock time in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# =============================================================================
+# CARD REGISTRATION
+# =============================================================================
+
+def _custom_card_definitions(count):
+    """Generate count custom card definitions with a name keyword and a shortcut"""
+    return [(f"custom {i}", [f"custom {i}", f"c{i}"], {"journey": 1}) for i in range(count)]
+
+
+def bench_card_registration(card_counts=(1000, 10000), legacy_limit=2000):
+    """
+    Time loading a custom card set one card at a time versus in one batch
+
+    The one-at-a-time engine path refreshes the legacy tuples per card, so it is
+    only timed up to legacy_limit cards.
+    """
+    results = {}
+    for count in card_counts:
+        definitions = _custom_card_definitions(count)
+
+        def manager_add_card():
+            manager = ActionCardManager()
+            for name, keywords, effect in definitions:
+                manager.add_card(name, keywords, effect, "custom")
+
+        def manager_add_cards():
+            ActionCardManager().add_cards(definitions, category="custom")
+
+        def engine_add_custom_card():
+            engine = ClassGameEngine(headless=True)
+            for name, keywords, effect in definitions:
+                engine.add_custom_card(name, keywords, effect)
+
+        def engine_add_custom_cards():
+            ClassGameEngine(headless=True).add_custom_cards(definitions)
+
+        results[count] = {
+            'manager.add_card': _best_time(manager_add_card),
+            'manager.add_cards': _best_time(manager_add_cards),
+            'engine.add_custom_card': _best_time(engine_add_custom_card, repeat=1) if count <= legacy_limit else None,
+            'engine.add_custom_cards': _best_time(engine_add_custom_cards)
+        }
+    return results
+
+
+# =============================================================================
+# LOGGING OVERHEAD
+# =============================================================================
+
+def bench_turn_logging(num_games=300):
+    """
+    Compare turn throughput of headless games with logging on and off
+
+    Cases: quiet engine flag, logging below the logger level, and DEBUG logging
+    written to an in-memory stream.
+    """
+    engine_logger = logging.getLogger("GameEngine")
+    handler = logging.StreamHandler(io.StringIO())
+    old_level = engine_logger.level
+    old_propagate = engine_logger.propagate
+
+    def turns_per_second(quiet):
+        turns = 0
+        start = time.perf_counter()
+        for seed in range(num_games):
+            engine = ClassGameEngine(headless=True, seed=seed, quiet=quiet)
+            turns += engine.run_headless_game()['turns']
+        return turns / (time.perf_counter() - start)
+
+    results = {}
+    try:
+        engine_logger.propagate = False
+        engine_logger.addHandler(handler)
+
+        results['quiet engine'] = turns_per_second(quiet=True)
+
+        engine_logger.setLevel(logging.WARNING)
+        results['logging filtered by level'] = turns_per_second(quiet=False)
+
+        engine_logger.setLevel(logging.DEBUG)
+        results['logging at DEBUG'] = turns_per_second(quiet=False)
+    finally:
+        engine_logger.removeHandler(handler)
+        engine_logger.setLevel(old_level)
+        engine_logger.propagate = old_propagate
+    return results
+
+
+# =============================================================================
+# SAVE FORMATS
+# =============================================================================
+
+SAVE_FORMATS = {
+    'json (indent=4)': (JsonSerializer(indent=4), None),
+    'json compact': (JsonSerializer(indent=None), None),
+    'json compact + zlib': (JsonSerializer(indent=None), 'zlib'),
+    'binary': (BinarySerializer(), None),
+    'binary + zlib': (BinarySerializer(), 'zlib'),
+    'binary + lzma': (BinarySerializer(), 'lzma'),
+}
+
+
+def _sample_game_data(num_players=5):
+    """Game data for a dealt game, as SaveManager.save_game builds it"""
+    engine = ClassGameEngine(headless=True, seed=0)
+    engine.initialize_game(num_players)
+    return {
+        'game_state': engine.state.to_dict(),
+        'players': engine.get_player_data(),
+        'settings': {'autosave_enabled': True, 'autosave_interval': 5}
+    }
+
+
+def bench_save_formats(repeat=200):
+    """
+    Compare file size and save/load latency of every save format
+
+    Times encoding plus writing the file (and reading plus decoding) the way
+    PersistenceManager does, without the save index update every save also
+    pays; that cost is the same for all formats.
+    """
+    game_data = _sample_game_data()
+    results = {}
+
+    with tempfile.TemporaryDirectory() as save_directory:
+        for name, (serializer, compression) in SAVE_FORMATS.items():
+            filepath = os.path.join(save_directory, f"bench_{len(results)}")
+
+            def save():
+                for _ in range(repeat):
+                    with open(filepath, 'wb') as save_file:
+                        save_file.write(encode_save(game_data, serializer, compression))
+
+            def load():
+                for _ in range(repeat):
+                    with open(filepath, 'rb') as save_file:
+                        decode_save(save_file.read())
+
+            save_time = _best_time(save) / repeat
+            load_time = _best_time(load) / repeat
+
+            results[name] = {
+                'bytes': os.path.getsize(filepath),
+                'save': save_time,
+                'load': load_time
+            }
+    return results
+
+
+# =============================================================================
+# GUI FRAME
+# =============================================================================
+
+def _game_screen(text_cache_bytes):
+    """Headless game screen (SDL dummy video driver) with a started two-player game"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from graphics_manager import GraphicsManager
+    from ui_renderer import UIRenderer
+    from button_manager import ButtonManager
+    from game_state_manager import GameStateManager
+
+    pygame.init()
+    screen = pygame.display.set_mode((1500, 750))
+    # Load every image up front so frames draw the real graphics, not loading placeholders
+    graphics = GraphicsManager()
+    graphics.preload()
+    graphics.wait_until_loaded(timeout=5)
+    renderer = UIRenderer(screen, graphics, text_cache_bytes=text_cache_bytes)
+    buttons = ButtonManager(1500, 750)
+    game_state = GameStateManager(ClassGameEngine(headless=True, seed=0))
+    game_state.engine.initialize_game(2)
+    return pygame, renderer, buttons, game_state
+
+
+def bench_gui_frame(frames=300):
+    """
+    Time a full game screen redraw with the text surface cache off and on
+
+    Draws the same elements as runGUI_game's full redraw path.
+    """
+    from ui_renderer import TextSurfaceCache
+
+    results = {}
+    for case, text_cache_bytes in (('no text cache', 0), ('text cache', TextSurfaceCache.DEFAULT_MAX_BYTES)):
+        pygame, renderer, buttons, game_state = _game_screen(text_cache_bytes)
+
+        def draw_frames():
+            for _ in range(frames):
+                renderer.screen.fill(renderer.BACKGROUND_COLOR)
+                renderer.draw_image_space()
+                renderer.draw_textbox(game_state.get_status_text())
+                renderer.draw_progress_bar(game_state.get_total_progress())
+                renderer.draw_paths(game_state.get_actionpaths())
+                for i, button_text in enumerate(buttons.action_buttons):
+                    button_rect = buttons.get_action_button_rect(i)
+                    renderer.draw_button(button_rect, button_text)
+                    card_count = game_state.get_player_card_count(button_text)
+                    if card_count > 0:
+                        renderer.draw_card_count(button_rect, card_count)
+                for i, button_text in enumerate(buttons.control_buttons):
+                    renderer.draw_button(buttons.get_control_button_rect(i), button_text)
+                renderer.draw_button(buttons.quit_button_rect, "QUIT")
+
+        results[case] = _best_time(draw_frames) / frames
+    pygame.quit()
+    return results
+
+
+def bench_board_layer(sizes=((800, 450), (1500, 750), (1920, 1080)), frames=300):
+    """Time drawing the progress bar and paths shape by shape versus from the board layer"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from graphics_manager import GraphicsManager
+    from ui_renderer import UIRenderer
+
+    pygame.init()
+    actionpaths = {"battle": 3, "craftsmanship": 0, "fellowship": 7, "journey": 5}
+    results = {}
+    for width, height in sizes:
+        screen = pygame.display.set_mode((width, height))
+        renderer = UIRenderer(screen, GraphicsManager())
+        results[f"{width}x{height}"] = cases = {}
+
+        for case, use_board_layer in (('shapes', False), ('board layer', True)):
+            renderer.use_board_layer = use_board_layer
+
+            def draw_frames():
+                for _ in range(frames):
+                    renderer.draw_progress_bar(15)
+                    renderer.draw_paths(actionpaths)
+
+            cases[case] = _best_time(draw_frames) / frames
+    pygame.quit()
+    return results
+
+
+# =============================================================================
+# BENCHMARK SUITE
+# =============================================================================
+
+# name -> context manager factory: sets up, yields the zero-argument callable to time, cleans up
+SUITE = {}
+
+
+def suite_benchmark(name):
+    """Register a generator function as a suite benchmark (see SUITE)"""
+    def register(factory):
+        SUITE[name] = contextlib.contextmanager(factory)
+        return factory
+    return register
+
+
+@suite_benchmark("command_manager.parse_input (5 inputs)")
+def _suite_parse_input():
+    parse_input = CommandManager(ActionCardManager()).parse_input
+    inputs = ("battle", "2x wits", "skip", "q", "no such card")
+
+    def parse():
+        for user_input in inputs:
+            parse_input(user_input)
+    yield parse
+
+
+@suite_benchmark("card_manager.deal_random_cards (6 cards)")
+def _suite_deal_random_cards():
+    yield ActionCardManager(rng=random.Random(0)).deal_random_cards
+
+
+@suite_benchmark("player.play_card")
+def _suite_play_card():
+    player = Player(1, card_manager=ActionCardManager())
+    player.actioncards["battle"] = 10 ** 9  # never runs out
+    yield lambda: player.play_card("battle")
+
+
+def _endless_turns(engine):
+    """Start a two-player game whose players never run out of battle and wits cards"""
+    engine.initialize_game(2)
+    engine.game_statusID = 1000
+    for player in engine.players:
+        player.actioncards["battle"] = 10 ** 9
+        player.actioncards["wits"] = 10 ** 9
+
+    def turn():
+        engine.play_input("battle")
+        engine.play_input("wits")
+    return turn
+
+
+@suite_benchmark("engine turn (headless)")
+def _suite_turn_headless():
+    yield _endless_turns(ClassGameEngine(headless=True, seed=0))
+
+
+@suite_benchmark("engine turn (GUI configuration)")
+def _suite_turn_gui_configuration():
+    with tempfile.TemporaryDirectory() as save_directory:
+        engine = ClassGameEngine(seed=0, quiet=True, save_file=os.path.join(save_directory, "playerdata.json"),
+                                 undo_history=UndoHistory())
+        yield _endless_turns(engine)
+
+
+@suite_benchmark("engine.save_player_data (5 players)")
+def _suite_save_player_data():
+    with tempfile.TemporaryDirectory() as save_directory:
+        engine = ClassGameEngine(headless=True, seed=0, save_file=os.path.join(save_directory, "playerdata.json"))
+        engine.initialize_game(5)
+        yield engine.save_player_data
+
+
+@suite_benchmark("engine.load_player_data_from_file (5 players)")
+def _suite_load_player_data():
+    with tempfile.TemporaryDirectory() as save_directory:
+        engine = ClassGameEngine(headless=True, seed=0, save_file=os.path.join(save_directory, "playerdata.json"))
+        engine.initialize_game(5)
+        engine.save_player_data()
+        yield engine.load_player_data_from_file
+
+
+@contextlib.contextmanager
+def _save_directory(num_files):
+    """PersistenceManager over num_files small save files, with its index built"""
+    with tempfile.TemporaryDirectory() as save_directory:
+        for i in range(num_files):
+            with open(os.path.join(save_directory, f"save_{i:05d}.json"), "w") as save_file:
+                json.dump({'metadata': {'version': '1.0.0', 'timestamp': f"2024-01-01T00:00:00.{i:06d}"},
+                           'players': {}}, save_file)
+        manager = PersistenceManager(save_directory)
+        manager.count_save_files()
+        yield manager
+
+
+@suite_benchmark("persistence.list_save_files (10k files)")
+def _suite_list_save_files():
+    with _save_directory(10000) as manager:
+        yield manager.list_save_files
+
+
+@suite_benchmark("persistence.list_save_files (10k files, page of 20)")
+def _suite_list_save_files_page():
+    with _save_directory(10000) as manager:
+        yield lambda: manager.list_save_files(offset=100, limit=20)
+
+
+@contextlib.contextmanager
+def _started_gui():
+    """ClassBoardGameGUI (SDL dummy video driver) with a started two-player game"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from gui import ClassBoardGameGUI
+
+    with tempfile.TemporaryDirectory() as save_directory:
+        engine = ClassGameEngine(seed=0, quiet=True, save_file=os.path.join(save_directory, "playerdata.json"))
+        gui = ClassBoardGameGUI(engine)
+        gui._start_game()
+        # Nothing is requested from the lazy loader until the first frame, so load everything now
+        gui.graphics.preload()
+        gui.graphics.wait_until_loaded(timeout=5)
+        try:
+            yield gui
+        finally:
+            pygame.quit()
+
+
+@suite_benchmark("runGUI_game frame (full redraw)")
+def _suite_gui_frame_full():
+    with _started_gui() as gui:
+        def frame():
+            gui.renderer.invalidate()
+            gui._game_frame([])
+        yield frame
+
+
+@suite_benchmark("runGUI_game frame (idle)")
+def _suite_gui_frame_idle():
+    with _started_gui() as gui:
+        yield lambda: gui._game_frame([])
+
+
+def run_suite(patterns=None, rounds=7, round_time=0.1):
+    """
+    Time the suite benchmarks
+
+    Each benchmark is calibrated so one round takes about round_time seconds,
+    then timed for rounds rounds.
+
+    Args:
+        patterns: Only run benchmarks whose name contains one of these substrings
+        rounds: Timed rounds per benchmark
+        round_time: Target seconds per round
+
+    Returns:
+        dict: {name: {'min', 'median', 'mean', 'stdev' (seconds per call), 'rounds', 'iterations'}}
+    """
+    results = {}
+    for name, factory in SUITE.items():
+        if patterns and not any(pattern in name for pattern in patterns):
+            continue
+        with factory() as func:
+            timer = timeit.Timer(func)
+            number, elapsed = timer.autorange()
+            iterations = max(1, int(number * round_time / elapsed))
+            times = [total / iterations for total in timer.repeat(rounds, iterations)]
+        results[name] = {
+            'min': min(times),
+            'median': statistics.median(times),
+            'mean': statistics.fmean(times),
+            'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+            'rounds': rounds,
+            'iterations': iterations
+        }
+    return results
+
+
+def _environment():
+    """Commit and machine the results were measured on"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine()
+    }
+
+
+def save_results(results, path):
+    """Store suite results with their environment as JSON"""
+    with open(path, "w") as results_file:
+        json.dump({'environment': _environment(), 'benchmarks': results}, results_file, indent=2)
+
+
+def load_results(path):
+    """Benchmark results ({name: stats}) of a file written by save_results"""
+    with open(path, "r") as results_file:
+        return json.load(results_file)['benchmarks']
+
+
+def compare_results(baseline, current, threshold=0.10):
+    """
+    Compare the median time of every benchmark present in both result sets
+
+    Returns:
+        dict: {name: (baseline median, current median, ratio, regressed)}; regressed
+              is True when the current median is more than threshold slower
+    """
+    comparison = {}
+    for name, stats in current.items():
+        if name in baseline:
+            ratio = stats['median'] / baseline[name]['median']
+            comparison[name] = (baseline[name]['median'], stats['median'], ratio, ratio > 1 + threshold)
+    return comparison
+
+
+def _format_time(seconds):
+    """Seconds as a short string in a readable unit"""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.0f} ns"
+
+
+# pytest-benchmark entry point; only defined when the plugin (and its benchmark fixture) is installed
+try:
+    import pytest
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    pytest = None
+
+if pytest is not None:
+    @pytest.mark.parametrize("name", list(SUITE))
+    def test_suite(benchmark, name):
+        """Run one suite benchmark with pytest-benchmark"""
+        with SUITE[name]() as func:
+            benchmark(func)
+
+
+def _print_results(title, results):
+    """Print a {size: {case: seconds}} table in milliseconds"""
+    print(f"\n{title}")
+    for size, cases in results.items():
+        print(f"  {size}:")
+        for case, seconds in cases.items():
+            timing = f"{seconds * 1000:10.2f} ms" if seconds is not None else f"{'skipped':>13}"
+            print(f"    {case:<28}{timing}")
+
+
+def _run_studies():
+    """Print the comparison studies"""
+    _print_results("Card registration (cards loaded)", bench_card_registration())
+
+    print("\nTurn throughput (turns/s)")
+    for case, rate in bench_turn_logging().items():
+        print(f"    {case:<28}{rate:10.0f}")
+
+    print("\nSave formats (5 players)")
+    for name, result in bench_save_formats().items():
+        print(f"    {name:<24}{result['bytes']:7d} bytes  save {result['save'] * 1e6:7.1f} us"
+              f"  load {result['load'] * 1e6:7.1f} us")
+
+    print("\nGame screen frame time (SDL dummy driver)")
+    for case, seconds in bench_gui_frame().items():
+        print(f"    {case:<28}{seconds * 1000:10.3f} ms")
+
+    _print_results("Board drawing per frame (window size)", bench_board_layer())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the v0.20 hot paths")
+    parser.add_argument("-k", dest="patterns", action="append",
+                        help="only run suite benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--rounds", type=int, default=7, help="timed rounds per benchmark")
+    parser.add_argument("--json", help="write the suite results to this JSON file")
+    parser.add_argument("--compare", help="compare with results stored by --json; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown of the median counted as a regression (default: 0.10)")
+    parser.add_argument("--studies", action="store_true", help="also run the comparison studies")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.patterns, rounds=args.rounds)
+    print("Suite (median per call, min, stdev)")
+    for name, stats in results.items():
+        print(f"    {name:<52}{_format_time(stats['median'])}{_format_time(stats['min'])}"
+              f"  +-{_format_time(stats['stdev'])}")
+
+    if args.json:
+        save_results(results, args.json)
+        print(f"\nResults written to {args.json}")
+
+    regressions = 0
+    if args.compare:
+        print(f"\nCompared with {args.compare} (regression: more than {args.threshold:.0%} slower)")
+        for name, (before, after, ratio, regressed) in compare_results(
+                load_results(args.compare), results, args.threshold).items():
+            regressions += regressed
+            print(f"    {name:<52}{_format_time(before)} ->{_format_time(after)}  x{ratio:5.2f}"
+                  f"{'  REGRESSION' if regressed else ''}")
+
+    if args.studies:
+        _run_studies()
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
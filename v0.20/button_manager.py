@@ -3,6 +3,9 @@ import pygame
 class ButtonManager:
     """Manages button layouts and interactions"""
     
+    # Side length in pixels of the hit-test grid cells
+    GRID_CELL_SIZE = 64
+    
     def __init__(self, screen_width, screen_height):
         self.WIDTH = screen_width
         self.HEIGHT = screen_height
@@ -30,50 +33,65 @@ class ButtonManager:
             self.button_width, 
             self.button_height
         )
+        
+        # Cached layout and hit-test grid, rebuilt after any layout change
+        self._layout = None
+    
+    # =============================================================================
+    # LAYOUT CACHE
+    # =============================================================================
+    
+    def invalidate_layout(self):
+        """Rebuild button rects and the hit-test grid on next use (call after changing the geometry)"""
+        self._layout = None
+    
+    def _get_layout(self):
+        """Return (action rects, control rects, grid), computing them once per layout"""
+        if self._layout is None:
+            action_rects = [
+                pygame.Rect(index * self.button_width, self.button_start_y, self.button_width, self.button_height)
+                for index in range(len(self.action_buttons))
+            ]
+            control_rects = [
+                pygame.Rect(20, 20 + index * (self.button_height + 5), self.small_button_width, self.button_height)
+                for index in range(len(self.control_buttons))
+            ]
+            
+            # Hit-test priority: action buttons, control buttons, then special buttons
+            buttons = [("action", name, rect) for name, rect in zip(self.action_buttons, action_rects)]
+            buttons += [("control", name, rect) for name, rect in zip(self.control_buttons, control_rects)]
+            buttons.append(("special", "quit", self.quit_button_rect))
+            buttons.append(("special", "start", self.start_button_rect))
+            
+            # Uniform grid: cell -> buttons overlapping it, in hit-test order
+            grid = {}
+            size = self.GRID_CELL_SIZE
+            for button_type, name, rect in buttons:
+                for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+                    for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                        grid.setdefault((cell_x, cell_y), []).append(((button_type, name), rect))
+            
+            self._layout = (action_rects, control_rects, grid)
+        return self._layout
     
     def get_action_button_rect(self, index):
-        """Get rectangle for action button at index"""
+        """Get rectangle for action button at index (cached; do not modify)"""
         if 0 <= index < len(self.action_buttons):
-            return pygame.Rect(
-                index * self.button_width,
-                self.button_start_y,
-                self.button_width,
-                self.button_height
-            )
+            return self._get_layout()[0][index]
         return None
     
     def get_control_button_rect(self, index):
-        """Get rectangle for control button at index"""
+        """Get rectangle for control button at index (cached; do not modify)"""
         if 0 <= index < len(self.control_buttons):
-            return pygame.Rect(
-                20,
-                20 + index * (self.button_height + 5),
-                self.small_button_width,
-                self.button_height
-            )
+            return self._get_layout()[1][index]
         return None
     
     def get_clicked_button(self, pos):
         """Determine which button was clicked"""
-        # Check action buttons
-        for i, button_name in enumerate(self.action_buttons):
-            button_rect = self.get_action_button_rect(i)
-            if button_rect and button_rect.collidepoint(pos):
-                return ("action", button_name)
-        
-        # Check control buttons
-        for i, button_name in enumerate(self.control_buttons):
-            button_rect = self.get_control_button_rect(i)
-            if button_rect and button_rect.collidepoint(pos):
-                return ("control", button_name)
-        
-        # Check special buttons
-        if self.quit_button_rect.collidepoint(pos):
-            return ("special", "quit")
-        
-        if self.start_button_rect.collidepoint(pos):
-            return ("special", "start")
-        
+        size = self.GRID_CELL_SIZE
+        for button_info, rect in self._get_layout()[2].get((pos[0] // size, pos[1] // size), ()):
+            if rect.collidepoint(pos):
+                return button_info
         return None
     
     def add_action_button(self, button_name):
@@ -82,11 +100,13 @@ class ButtonManager:
             self.action_buttons.append(button_name)
             # Recalculate button width to fit all buttons
             self.button_width = self.WIDTH // len(self.action_buttons)
+            self.invalidate_layout()
     
     def add_control_button(self, button_name):
         """Add a new control button"""
         if button_name not in self.control_buttons:
             self.control_buttons.append(button_name)
+            self.invalidate_layout()
     
     def remove_action_button(self, button_name):
         """Remove an action button"""
@@ -95,11 +115,13 @@ class ButtonManager:
             # Recalculate button width
             if self.action_buttons:
                 self.button_width = self.WIDTH // len(self.action_buttons)
+            self.invalidate_layout()
     
     def remove_control_button(self, button_name):
         """Remove a control button"""
         if button_name in self.control_buttons:
             self.control_buttons.remove(button_name)
+            self.invalidate_layout()
     
     def get_all_button_rects(self):
         """Get all button rectangles for collision detection"""
@@ -1,10 +1,15 @@
 # commands.py - Simplified version for smooth integration
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from metrics import CommandMetrics, command_metric_name
 
 class Command(ABC):
     """Abstract base class for all game commands"""
     
+    # Label of the command type in CommandMetrics (default: the class name)
+    metric_name: Optional[str] = None
+    
     @abstractmethod
     def execute(self, context: Dict[str, Any]) -> Any:
         """Execute the command with given context"""
@@ -20,10 +25,20 @@ class Command(ABC):
     def description(self) -> str:
         """Get command description"""
         pass
+    
+    def changes(self, context: Dict[str, Any]) -> Optional[List[tuple]]:
+        """
+        State changes execute is about to make, as (target, key, old, new) tuples
+        
+        Returns None for commands that cannot be undone.
+        """
+        return None
 
 class QuitCommand(Command):
     """Command to quit the game"""
     
+    metric_name = "quit"
+    
     def execute(self, context: Dict[str, Any]) -> Any:
         from gamestate import GameStatus
         game_state = context['game_state']
@@ -33,6 +48,10 @@ class QuitCommand(Command):
     def can_execute(self, context: Dict[str, Any]) -> bool:
         return True
     
+    def changes(self, context: Dict[str, Any]) -> Optional[List[tuple]]:
+        from gamestate import GameStatus
+        return [('state', 'status', context['game_state'].status, GameStatus.COMPLETED)]
+    
     @property
     def description(self) -> str:
         return "Quit the game"
@@ -40,6 +59,8 @@ class QuitCommand(Command):
 class SkipTurnCommand(Command):
     """Command to skip current turn"""
     
+    metric_name = "skip"
+    
     def execute(self, context: Dict[str, Any]) -> Any:
         game_state = context['game_state']
         game_state.current_action_key = "skip"
@@ -53,6 +74,14 @@ class SkipTurnCommand(Command):
         # Can skip if game is running or initialized
         return game_state.status in [GameStatus.RUNNING, GameStatus.INITIALIZED]
     
+    def changes(self, context: Dict[str, Any]) -> Optional[List[tuple]]:
+        game_state = context['game_state']
+        return [
+            ('state', 'current_action_key', game_state.current_action_key, "skip"),
+            ('state', 'user_input_counter', game_state.user_input_counter, game_state.user_input_counter + 1),
+            ('state', 'action_cards_played', game_state.action_cards_played, 2)
+        ]
+    
     @property
     def description(self) -> str:
         return "Skip current turn"
@@ -60,6 +89,8 @@ class SkipTurnCommand(Command):
 class PlayCardCommand(Command):
     """Command to play an action card"""
     
+    metric_name = "play_card"
+    
     def __init__(self, card_name: str):
         self.card_name = card_name
     
@@ -82,6 +113,15 @@ class PlayCardCommand(Command):
                 active_player is not None and
                 game_state.action_cards_played < 2)
     
+    def changes(self, context: Dict[str, Any]) -> Optional[List[tuple]]:
+        # Selecting the card; removing it from the hand and its effect are
+        # recorded by the engine steps that perform them
+        game_state = context['game_state']
+        return [
+            ('state', 'user_input_counter', game_state.user_input_counter, game_state.user_input_counter + 1),
+            ('state', 'current_action_key', game_state.current_action_key, self.card_name)
+        ]
+    
     @property
     def description(self) -> str:
         return f"Play action card: {self.card_name}"
@@ -89,9 +129,11 @@ class PlayCardCommand(Command):
 class CommandManager:
     """Manages and executes game commands"""
     
-    def __init__(self, card_manager):
+    def __init__(self, card_manager, metrics: bool = True):
         self.card_manager = card_manager
         self.commands: Dict[str, Command] = {}
+        # Execution counts and latency histograms (None: instrumentation off)
+        self.metrics: Optional[CommandMetrics] = CommandMetrics() if metrics else None
         self._register_default_commands()
     
     def _register_default_commands(self):
@@ -117,19 +159,28 @@ class CommandManager:
         if input_lower in self.commands:
             return self.commands[input_lower]
         
-        # Check if it's a card play command
-        if self.card_manager.validate_input(user_input):
-            card_name = self.card_manager.resolve_input_to_card_name(user_input)
-            if card_name:
-                return PlayCardCommand(card_name)
+        # Check if it's a card play command (one lookup validates and resolves)
+        card_name = self.card_manager.resolve_keyword(input_lower)
+        if card_name:
+            return PlayCardCommand(card_name)
         
+        if self.metrics is not None:
+            self.metrics.invalid_inputs += 1
         return None
     
     def execute_command(self, command: Command, context: Dict[str, Any]) -> Any:
         """Execute a command with validation"""
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
         if command.can_execute(context):
-            return command.execute(context)
+            result = command.execute(context)
+            if metrics is not None:
+                metrics.observe(command_metric_name(command), time.perf_counter() - start)
+            return result
         else:
+            if metrics is not None:
+                metrics.reject(command_metric_name(command))
             return {'success': False, 'reason': 'Command cannot be executed in current context'}
     
     def get_available_commands(self, context: Dict[str, Any]) -> Dict[str, str]:
@@ -0,0 +1,113 @@
+# events.py - Lightweight publish/subscribe bus for engine events
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EngineEvent:
+    """Base class of all engine events; subscribing to it receives every event"""
+
+
+@dataclass(frozen=True)
+class CardPlayed(EngineEvent):
+    """A player spent an action card"""
+    player_id: int
+    card_name: str
+    cards_played: int           # cards played this turn, including this one
+
+
+@dataclass(frozen=True)
+class EffectApplied(EngineEvent):
+    """A card effect moved the action paths"""
+    card_name: str
+    changes: Tuple[Tuple[str, int, int], ...]   # (path, old, new) for every path moved
+
+
+@dataclass(frozen=True)
+class PlayerChanged(EngineEvent):
+    """The turn passed to another player"""
+    previous_player_id: int
+    player_id: int
+
+
+@dataclass(frozen=True)
+class RoundIncremented(EngineEvent):
+    """A new round started"""
+    round_counter: int
+
+
+@dataclass(frozen=True)
+class StatusChanged(EngineEvent):
+    """The game status changed (old and new are GameStatus members)"""
+    old_status: Any
+    status: Any
+
+
+@dataclass(frozen=True)
+class StateRestored(EngineEvent):
+    """State was replaced wholesale ('undo', 'redo' or 'load'); re-read everything"""
+    reason: str
+
+
+EVENT_TYPES = (CardPlayed, EffectApplied, PlayerChanged, RoundIncremented, StatusChanged, StateRestored)
+
+
+class EventBus:
+    """
+    Synchronous publish/subscribe dispatcher for EngineEvent subclasses.
+
+    Publishers check `event_type in bus.listening` before building an event,
+    so an event nobody subscribes to costs one set lookup and no allocation.
+    Handlers run in subscription order on the publishing thread; a handler
+    that raises is logged and does not stop the others or the engine.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[Type[EngineEvent], Tuple[Callable, ...]] = {}
+        self.listening = frozenset()    # event types with at least one handler
+
+    def subscribe(self, event_type: Type[EngineEvent], handler: Callable[[EngineEvent], Any]) -> Callable[[], None]:
+        """
+        Call handler(event) for every published event of event_type
+
+        Returns:
+            Callable that unsubscribes the handler
+        """
+        # Handler tuples are replaced, never mutated, so handlers may (un)subscribe while publishing
+        self._handlers[event_type] = self._handlers.get(event_type, ()) + (handler,)
+        self._update_listening()
+        return lambda: self.unsubscribe(event_type, handler)
+
+    def unsubscribe(self, event_type: Type[EngineEvent], handler: Callable[[EngineEvent], Any]) -> None:
+        """Remove a handler added with subscribe (no-op if it is not subscribed)"""
+        handlers = list(self._handlers.get(event_type, ()))
+        if handler in handlers:
+            handlers.remove(handler)
+            if handlers:
+                self._handlers[event_type] = tuple(handlers)
+            else:
+                del self._handlers[event_type]
+            self._update_listening()
+
+    def _update_listening(self) -> None:
+        if EngineEvent in self._handlers:
+            self.listening = frozenset(EVENT_TYPES)
+        else:
+            self.listening = frozenset(self._handlers)
+
+    def publish(self, event: EngineEvent) -> None:
+        """Deliver event to the handlers of its type, then to the EngineEvent handlers"""
+        handlers = self._handlers.get(type(event), ()) + self._handlers.get(EngineEvent, ())
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Event handler %r failed for %r", handler, event)
+
+    def clear(self) -> None:
+        """Remove all handlers"""
+        self._handlers.clear()
+        self.listening = frozenset()
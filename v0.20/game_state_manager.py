@@ -1,3 +1,9 @@
+import logging
+from types import MappingProxyType
+from events import PlayerChanged
+
+logger = logging.getLogger(__name__)
+
 class GameStateManager:
     """Manages game state and engine interactions"""
     
@@ -7,27 +13,62 @@ class GameStateManager:
         self.awaiting_input = False
         self.input_prompt = ""
         
+        # Derived values, reused until the engine's state version changes
+        self._cache = {}
+        self._cache_version = None
+        
         if self.engine is None:
             self._initialize_engine()
+        self._subscribe_to_engine()
     
     def _initialize_engine(self):
         """Initialize the game engine"""
         try:
             # Import your actual GameEngine
             from GameEngine import ClassGameEngine
-            self.engine = ClassGameEngine()
-            print("✓ Real GameEngine loaded successfully!")
-            print(f"Engine initialized with game_statusID: {self.engine.game_statusID}")
+            from history import UndoHistory
+            # Write-behind saves keep file I/O out of the pygame frame loop
+            self.engine = ClassGameEngine(save_interval=1.0, undo_history=UndoHistory())
+            logger.info("✓ Real GameEngine loaded successfully!")
+            logger.info("Engine initialized with game_statusID: %s", self.engine.game_statusID)
         except ImportError as e:
-            print(f"❌ GameEngine import failed: {e}")
-            print("Make sure GameEngine.py is in the same directory as your GUI")
+            logger.error("❌ GameEngine import failed: %s", e)
+            logger.error("Make sure GameEngine.py is in the same directory as your GUI")
 
+    def _subscribe_to_engine(self):
+        """React to engine events instead of comparing state before and after each action"""
+        events = getattr(self.engine, 'events', None)
+        if events is not None:
+            events.subscribe(PlayerChanged, self._on_player_changed)
+    
+    def _on_player_changed(self, event):
+        """Announce the new player at the end of a turn"""
+        self.current_message += f"\nTurn complete! Now Player {event.player_id}'s turn."
+    
+    def _cached(self, key, compute):
+        """
+        Return compute(), reusing the result until engine.state_version changes
+        
+        Engines that do not track versions (state_version is None) recompute every call.
+        """
+        version = getattr(self.engine, 'state_version', None)
+        if version is None:
+            return compute()
+        if version != self._cache_version:
+            self._cache.clear()
+            self._cache_version = version
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
     
     def get_status_text(self):
         """Generate status text based on current game state"""
         if not self.engine:
             return "No game engine loaded"
-        
+        return self._cached(('status_text', self.current_message), self._build_status_text)
+    
+    def _build_status_text(self):
+        """Format the status text from the engine's legacy properties"""
         status_lines = [
             f"Game Status: {getattr(self.engine, 'game_statusID', 'Unknown')}",
             f"Players: {getattr(self.engine, 'numberOfPlayers', 0)}",
@@ -48,23 +89,33 @@ class GameStateManager:
     
     def get_total_progress(self):
         """Get total progress from action paths"""
-        return sum(self.engine.actionpaths.values()) if hasattr(self.engine, 'actionpaths') else 0
+        if not hasattr(self.engine, 'actionpaths'):
+            return 0
+        return self._cached('total_progress', lambda: sum(self.engine.actionpaths.values()))
     
     def get_actionpaths(self):
-        """Get action paths dictionary"""
+        """Get a read-only view of the action paths dictionary"""
+        state = getattr(self.engine, 'state', None)
+        if state is not None:
+            return state.action_paths_view
         return getattr(self.engine, 'actionpaths', {})
     
     def get_player_card_count(self, card_name):
         """Get card count for active player"""
-        if (hasattr(self.engine, 'playerData') and self.engine.playerData and 
+        hand = self._cached('active_hand', self._get_active_hand)
+        return hand.get(card_name.lower(), 0) if hand is not None else 0
+    
+    def _get_active_player(self):
+        """Player object of the active player, or None"""
+        if (hasattr(self.engine, 'get_player_by_id') and 
             hasattr(self.engine, 'activePlayerID') and self.engine.activePlayerID > 0):
-            
-            player_key = f"player {self.engine.activePlayerID}"
-            if (player_key in self.engine.playerData and 
-                'actioncards' in self.engine.playerData[player_key]):
-                return self.engine.playerData[player_key]['actioncards'].get(card_name.lower(), 0)
-        
-        return 0
+            return self.engine.get_player_by_id(self.engine.activePlayerID)
+        return None
+    
+    def _get_active_hand(self):
+        """Read-only view of the active player's hand, or None"""
+        player = self._get_active_player()
+        return player.hand_view if player else None
     
     def set_message(self, message):
         """Set the current status message"""
@@ -75,15 +126,11 @@ class GameStateManager:
         self.current_message += f"\n{message}"
     
     def get_current_player_info(self):
-        """Get detailed information about the current player"""
-        if not hasattr(self.engine, 'playerData') or not self.engine.playerData:
-            return None
-            
-        player_key = f"player {self.engine.activePlayerID}"
-        if player_key in self.engine.playerData:
-            return self.engine.playerData[player_key]
-        
-        return None
+        """Get detailed information about the current player (read-only)"""
+        def build():
+            player = self._get_active_player()
+            return MappingProxyType(player.to_dict()) if player else None
+        return self._cached('player_info', build)
     
     def is_game_initialized(self):
         """Check if the game is properly initialized"""
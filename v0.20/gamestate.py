@@ -1,7 +1,72 @@
+import itertools
 from enum import Enum
 from dataclasses import dataclass, field
+from types import MappingProxyType
 from typing import Dict, Optional
 
+# One counter for every versioned object, so a change anywhere yields a larger
+# version than any seen before (consumers can compare the max across objects)
+_version_counter = itertools.count(1)
+_object_setattr = object.__setattr__
+
+def next_version() -> int:
+    """Next value of the global state version counter"""
+    return next(_version_counter)
+
+def bump_version(obj) -> None:
+    """Give obj a new version without going through its __setattr__"""
+    _object_setattr(obj, 'version', next(_version_counter))
+
+class VersionedDict(dict):
+    """dict that bumps its owner's version on every write"""
+    
+    __slots__ = ('owner',)
+    
+    def __init__(self, data=(), owner=None):
+        super().__init__(data)
+        self.owner = owner
+    
+    def _changed(self):
+        if self.owner is not None:
+            _object_setattr(self.owner, 'version', next(_version_counter))
+    
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        # Inlined _changed: this is on the per-card hot path
+        if self.owner is not None:
+            _object_setattr(self.owner, 'version', next(_version_counter))
+    
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._changed()
+    
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._changed()
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+    
+    def pop(self, *args):
+        value = dict.pop(self, *args)
+        self._changed()
+        return value
+    
+    def popitem(self):
+        item = dict.popitem(self)
+        self._changed()
+        return item
+    
+    def clear(self):
+        dict.clear(self)
+        self._changed()
+    
+    def __reduce__(self):
+        # Copies and pickles are plain dicts, detached from the owner
+        return (dict, (dict(self),))
+
 class GameStatus(Enum):
     """Enumeration for game status values"""
     NOT_STARTED = 0
@@ -42,6 +107,11 @@ class GameState:
         "journey": 0
     })
     
+    @property
+    def action_paths_view(self):
+        """Read-only, zero-copy view of action_paths"""
+        return MappingProxyType(self.action_paths)
+    
     def reset(self):
         """Reset game state to initial values"""
         self.status = GameStatus.INITIALIZED
@@ -103,4 +173,17 @@ class GameState:
         state.current_action_key = data.get('current_action_key', "")
         state.user_input_counter = data.get('user_input_counter', 0)
         state.action_paths = data.get('action_paths', state.action_paths)
-        return state
\ No newline at end of file
+        return state
+
+class VersionedGameState(GameState):
+    """
+    GameState that stamps a global version (see next_version) on every change,
+    including in-place edits of action_paths, so readers can cache derived values.
+    """
+    
+    def __setattr__(self, name, value):
+        if name == 'action_paths' and not (isinstance(value, VersionedDict) and value.owner is self):
+            value = VersionedDict(value, self)
+        _object_setattr(self, name, value)
+        if name != 'version':
+            _object_setattr(self, 'version', next(_version_counter))
@@ -1,33 +1,361 @@
 import pygame
+import logging
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+# Asset manifest: image name -> file path. Images are decoded on first use (or by preload)
+ASSET_MANIFEST = {
+    "odysseus": os.path.join("gamegraphics", "odysseus_01.png"),
+    # Add more images here as needed
+}
+
+MISSING_COLOR = (255, 0, 255)
+ERROR_COLOR = (255, 0, 0)
+LOADING_COLOR = (40, 40, 40)
+
+class SpriteCache:
+    """
+    LRU cache of decoded images keyed by name, bounded by pixel memory.
+    
+    Least recently used images are evicted once max_bytes is exceeded (the
+    newest image is always kept). on_evict(name) is called for every evicted
+    image so dependent data can be dropped too.
+    """
+    
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, on_evict=None):
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self._surfaces = OrderedDict()
+        self.memory_usage = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def surface_bytes(surface):
+        """Pixel memory of a surface"""
+        return surface.get_pitch() * surface.get_height()
+    
+    def get(self, name, default=None):
+        """Return the image and mark it most recently used (counts a hit or miss)"""
+        surface = self._surfaces.get(name)
+        if surface is None:
+            self.misses += 1
+            return default
+        self._surfaces.move_to_end(name)
+        self.hits += 1
+        return surface
+    
+    def __setitem__(self, name, surface):
+        self.pop(name, None)
+        self._surfaces[name] = surface
+        self.memory_usage += self.surface_bytes(surface)
+        while self.memory_usage > self.max_bytes and len(self._surfaces) > 1:
+            evicted_name, evicted = self._surfaces.popitem(last=False)
+            self.memory_usage -= self.surface_bytes(evicted)
+            self.evictions += 1
+            if self.on_evict:
+                self.on_evict(evicted_name)
+    
+    def pop(self, name, default=None):
+        """Remove an image without counting it as an eviction"""
+        surface = self._surfaces.pop(name, None)
+        if surface is None:
+            return default
+        self.memory_usage -= self.surface_bytes(surface)
+        return surface
+    
+    def __contains__(self, name):
+        return name in self._surfaces
+    
+    def keys(self):
+        return self._surfaces.keys()
+    
+    def clear(self):
+        """Drop all cached images"""
+        self._surfaces.clear()
+        self.memory_usage = 0
+    
+    def __len__(self):
+        return len(self._surfaces)
+
+class TextureAtlas:
+    """
+    Small images (card icons) packed into one surface and drawn with area blits.
+    
+    Images are packed on shelves: left to right, and a new shelf starts below
+    the tallest image of the previous one. One large surface instead of many
+    small ones keeps icon memory fixed and avoids per-surface overhead.
+    
+    Re-adding a name at the same size reuses its area; at another size it gets
+    a new area and the old one is left behind. When an image no longer fits,
+    the atlas is compacted (repacked without those areas) before giving up.
+    """
+    
+    DEFAULT_SIZE = (1024, 1024)
+    PADDING = 1
+    
+    def __init__(self, size=DEFAULT_SIZE):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.rects = {}
+        self._x = 0
+        self._y = 0
+        self._shelf_height = 0
+        self._converted = False
+        self._stale = False     # areas of images re-added at another size are unused
+    
+    def add(self, name, image):
+        """
+        Copy image into the atlas
+        
+        Returns:
+            pygame.Rect: Area of the image in the atlas, or None if the atlas is full
+        """
+        width, height = image.get_size()
+        rect = self.rects.get(name)
+        if rect is None or rect.size != (width, height):
+            new_rect = self._allocate(width, height)
+            if new_rect is None and self._stale and self.compact():
+                new_rect = self._allocate(width, height)
+            if new_rect is None:
+                return None
+            self._stale = self._stale or rect is not None
+            rect = new_rect
+        
+        # The area is transparent, so a max blend copies the pixels (alpha included) unchanged
+        self.surface.fill((0, 0, 0, 0), rect)
+        self.surface.blit(image, rect, special_flags=pygame.BLEND_RGBA_MAX)
+        self.rects[name] = rect
+        return rect
+    
+    def _allocate(self, width, height):
+        """Next free area on the shelves, or None if the atlas is full"""
+        atlas_width, atlas_height = self.surface.get_size()
+        x, y, shelf_height = self._x, self._y, self._shelf_height
+        if x + width > atlas_width:
+            x = 0
+            y += shelf_height + self.PADDING
+            shelf_height = 0
+        if width > atlas_width or y + height > atlas_height:
+            return None
+        self._x = x + width + self.PADDING
+        self._y = y
+        self._shelf_height = max(shelf_height, height)
+        return pygame.Rect(x, y, width, height)
+    
+    def compact(self):
+        """
+        Repack the images (tallest first) to reclaim areas left behind by re-adds
+        
+        Returns:
+            bool: True if repacked; False if they did not fit again (the atlas is unchanged)
+        """
+        old_state = (self.surface, self.rects, self._x, self._y, self._shelf_height, self._converted)
+        old_surface, old_rects = self.surface, self.rects
+        self.surface = pygame.Surface(old_surface.get_size(), pygame.SRCALPHA)
+        self.rects = {}
+        self._x = self._y = self._shelf_height = 0
+        self._converted = False
+        
+        for name, rect in sorted(old_rects.items(), key=lambda item: -item[1].height):
+            new_rect = self._allocate(rect.width, rect.height)
+            if new_rect is None:
+                self.surface, self.rects, self._x, self._y, self._shelf_height, self._converted = old_state
+                return False
+            self.surface.blit(old_surface, new_rect, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            self.rects[name] = new_rect
+        self._stale = False
+        return True
+    
+    def blit(self, dest, name, position):
+        """Draw one packed image onto dest; returns the dest Rect (None if name is not packed)"""
+        rect = self.rects.get(name)
+        if rect is None:
+            return None
+        if not self._converted and pygame.display.get_surface():
+            self.surface = self.surface.convert_alpha()
+            self._converted = True
+        return dest.blit(self.surface, position, rect)
+    
+    def __contains__(self, name):
+        return name in self.rects
+    
+    def __len__(self):
+        return len(self.rects)
 
 class GraphicsManager:
-    """Handles loading and managing game graphics"""
+    """
+    Handles loading and managing game graphics
     
-    def __init__(self):
-        self.images = {}
-        self.load_graphics()
+    With lazy loading (the default) nothing is decoded at startup: the first
+    get_image() for a manifest entry returns a placeholder and queues the file
+    for a background thread. Decoded images are converted to the display format
+    and swapped in on the main thread by process_loaded(), which get_image()
+    calls for you. preload() queues many assets at once; load_progress reports
+    how far they are.
     
-    def load_graphics(self):
-        """Load game graphics with error handling"""
-        graphics_files = {
-            "odysseus": os.path.join("gamegraphics", "odysseus_01.png"),
-            # Add more images here as needed
-        }
+    Decoded images live in a SpriteCache bounded by max_bytes; an evicted image
+    is simply loaded again from the manifest on its next use. Small card icons
+    go into a TextureAtlas instead (add_icon / draw_icon).
+    """
+    
+    ICON_SIZE = (64, 64)
+    
+    def __init__(self, manifest=None, lazy=True, max_bytes=SpriteCache.DEFAULT_MAX_BYTES):
+        self.manifest = dict(ASSET_MANIFEST if manifest is None else manifest)
+        self.images = SpriteCache(max_bytes, on_evict=self._on_evict)
+        self.atlas = TextureAtlas()
+        # name -> (container size, display size, surface) of the last scaled variant
+        self._variants = {}
         
-        for name, filepath in graphics_files.items():
+        # Background loading: names queued for the worker and decoded results awaiting the main thread
+        self._placeholders = {}
+        self._requested = set()
+        self._pending = set()
+        self._load_queue = queue.Queue()
+        self._decoded = deque()
+        self._worker = None
+        
+        if not lazy:
+            self.load_graphics()
+    
+    def load_graphics(self):
+        """Load every manifest image synchronously with error handling"""
+        for name, filepath in self.manifest.items():
             try:
                 if os.path.exists(filepath):
                     image = pygame.image.load(filepath)
                     self.images[name] = image
-                    print(f"✓ Loaded {name}: {filepath}")
+                    logger.info("✓ Loaded %s: %s", name, filepath)
+                else:
+                    logger.warning("❌ File not found: %s", filepath)
+                    self.images[name] = self._create_placeholder((100, 100), MISSING_COLOR)
+                    logger.warning("  Created placeholder for %s", name)
+            except pygame.error as e:
+                logger.error("❌ Error loading %s: %s", filepath, e)
+                self.images[name] = self._create_placeholder((100, 100), ERROR_COLOR)
+    
+    # =============================================================================
+    # BACKGROUND LOADING
+    # =============================================================================
+    
+    def request(self, name):
+        """Queue a manifest image for background decoding (no-op if loaded or queued)"""
+        if name in self.images or name in self._pending or name not in self.manifest:
+            return
+        self._requested.add(name)
+        self._pending.add(name)
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run_worker, name="GraphicsLoader", daemon=True)
+            self._worker.start()
+        self._load_queue.put((name, self.manifest[name]))
+    
+    def preload(self, names=None):
+        """Queue several images (default: the whole manifest) for background decoding"""
+        for name in (self.manifest if names is None else names):
+            self.request(name)
+    
+    @property
+    def is_loading(self):
+        """True while queued images have not been swapped in yet"""
+        return bool(self._pending)
+    
+    @property
+    def load_progress(self):
+        """Fraction (0.0-1.0) of the requested images that are loaded (1.0 if none requested)"""
+        if not self._requested:
+            return 1.0
+        return 1.0 - len(self._pending) / len(self._requested)
+    
+    def _run_worker(self):
+        """
+        Background loop: decode queued files; surfaces are handed to the main thread
+        
+        Every request gets a result, even a failed one, so is_loading always clears.
+        """
+        while True:
+            name, filepath = self._load_queue.get()
+            try:
+                if os.path.exists(filepath):
+                    result = (name, filepath, pygame.image.load(filepath), None)
                 else:
-                    print(f"❌ File not found: {filepath}")
-                    self.images[name] = self._create_placeholder((100, 100), (255, 0, 255))
-                    print(f"  Created placeholder for {name}")
+                    result = (name, filepath, None, "not found")
             except pygame.error as e:
-                print(f"❌ Error loading {filepath}: {e}")
-                self.images[name] = self._create_placeholder((100, 100), (255, 0, 0))
+                result = (name, filepath, None, str(e))
+            except Exception as e:
+                logger.exception("Unexpected error decoding %s", filepath)
+                result = (name, filepath, None, str(e) or type(e).__name__)
+            self._decoded.append(result)
+    
+    def process_loaded(self, max_images=None):
+        """
+        Swap decoded images in on the calling (main) thread
+        
+        Converting to the display format needs the display, so it happens here
+        rather than in the worker.
+        
+        Args:
+            max_images: Optional cap on how many images to convert this call
+            
+        Returns:
+            int: Number of images swapped in
+        """
+        count = 0
+        while self._decoded and (max_images is None or count < max_images):
+            name, filepath, image, error = self._decoded.popleft()
+            if name not in self._pending:
+                continue  # replaced by add_image while it was decoding
+            if image is not None:
+                if pygame.display.get_surface():
+                    image = image.convert_alpha() if image.get_flags() & pygame.SRCALPHA else image.convert()
+                logger.info("✓ Loaded %s: %s", name, filepath)
+            elif error == "not found":
+                logger.warning("❌ File not found: %s", filepath)
+                image = self._create_placeholder((100, 100), MISSING_COLOR)
+            else:
+                logger.error("❌ Error loading %s: %s", filepath, error)
+                image = self._create_placeholder((100, 100), ERROR_COLOR)
+            self.images[name] = image
+            self._variants.pop(name, None)
+            self._placeholders.pop(name, None)
+            self._pending.discard(name)
+            count += 1
+        return count
+    
+    def wait_until_loaded(self, timeout=None):
+        """Block until every requested image is swapped in; returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._pending:
+            self.process_loaded()
+            if not self._pending:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+    
+    def _on_evict(self, name):
+        """Drop the scaled variant of an image evicted from the sprite cache"""
+        self._variants.pop(name, None)
+    
+    def cache_stats(self):
+        """Sprite cache counters and memory use"""
+        return {
+            'hits': self.images.hits,
+            'misses': self.images.misses,
+            'evictions': self.images.evictions,
+            'images': len(self.images),
+            'bytes': self.images.memory_usage,
+            'max_bytes': self.images.max_bytes,
+            'icons': len(self.atlas)
+        }
     
     def _create_placeholder(self, size, color):
         """Create a colored placeholder surface"""
@@ -36,23 +364,131 @@ class GraphicsManager:
         return placeholder
     
     def get_image(self, name):
-        """Get an image by name"""
-        return self.images.get(name)
+        """
+        Get an image by name
+        
+        A manifest image that is not loaded yet is queued and returns a
+        placeholder until it arrives; unknown names return None.
+        """
+        if self._decoded:
+            self.process_loaded()
+        image = self.images.get(name)
+        if image is not None or name not in self.manifest:
+            return image
+        
+        self.request(name)
+        placeholder = self._placeholders.get(name)
+        if placeholder is None:
+            placeholder = self._placeholders[name] = self._create_placeholder((100, 100), LOADING_COLOR)
+        return placeholder
+    
+    def get_scaled_image(self, name, container_size, margin=20):
+        """
+        Get an image converted to the display format and scaled to fit a container
+        
+        The variant is built once and reused until the container or window size
+        changes, so drawing it is a plain blit.
+        
+        Args:
+            name: Image name
+            container_size: (width, height) the image must fit in
+            margin: Total horizontal/vertical margin kept free inside the container
+            
+        Returns:
+            pygame.Surface or None if the image is not loaded
+        """
+        image = self.get_image(name)
+        if image is None:
+            return None
+        
+        container_size = tuple(container_size)
+        display = pygame.display.get_surface()
+        display_size = display.get_size() if display else None
+        
+        variant = self._variants.get(name)
+        if variant and variant[0] == container_size and variant[1] == display_size:
+            return variant[2]
+        
+        surface = self.scale_to_fit(image, container_size, margin)
+        if display:
+            # Blitting a surface in the display's pixel format avoids a conversion per frame
+            surface = surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+        self._variants[name] = (container_size, display_size, surface)
+        return surface
+    
+    @staticmethod
+    def scale_to_fit(image, container_size, margin=20):
+        """Scale image down to fit container_size minus margin, keeping its aspect ratio"""
+        width, height = image.get_size()
+        scale_x = (container_size[0] - margin) / width
+        scale_y = (container_size[1] - margin) / height
+        scale = min(scale_x, scale_y, 1.0)
+        
+        if scale < 1.0:
+            return pygame.transform.scale(image, (int(width * scale), int(height * scale)))
+        return image
+    
+    def invalidate_variants(self):
+        """Drop all converted/scaled variants (e.g. after the display mode changed)"""
+        self._variants.clear()
     
-    def add_image(self, name, filepath):
-        """Add a new image to the manager"""
+    def add_image(self, name, filepath, max_size=None):
+        """
+        Add a new image to the manager
+        
+        Args:
+            name: Image name
+            filepath: Image file
+            max_size: Optional (width, height) the image is scaled down to fit on load
+        """
         try:
             if os.path.exists(filepath):
                 image = pygame.image.load(filepath)
+                if max_size is not None:
+                    image = self.scale_to_fit(image, max_size, margin=0)
+                self.manifest[name] = filepath
                 self.images[name] = image
-                print(f"✓ Added {name}: {filepath}")
+                self._variants.pop(name, None)
+                self._placeholders.pop(name, None)
+                self._pending.discard(name)
+                logger.info("✓ Added %s: %s", name, filepath)
                 return True
             else:
-                print(f"❌ File not found: {filepath}")
+                logger.warning("❌ File not found: %s", filepath)
+                return False
+        except pygame.error as e:
+            logger.error("❌ Error loading %s: %s", filepath, e)
+            return False
+    
+    def add_icon(self, name, filepath, size=None):
+        """
+        Load a small image (e.g. card art icon) into the texture atlas
+        
+        Args:
+            name: Icon name
+            filepath: Image file
+            size: (width, height) the icon is scaled down to fit (default: ICON_SIZE)
+            
+        Returns:
+            bool: True if the icon was packed
+        """
+        try:
+            if not os.path.exists(filepath):
+                logger.warning("❌ File not found: %s", filepath)
                 return False
+            image = self.scale_to_fit(pygame.image.load(filepath), size or self.ICON_SIZE, margin=0)
         except pygame.error as e:
-            print(f"❌ Error loading {filepath}: {e}")
+            logger.error("❌ Error loading %s: %s", filepath, e)
             return False
+        
+        if self.atlas.add(name, image) is None:
+            logger.warning("❌ Texture atlas full, cannot add icon %s", name)
+            return False
+        return True
+    
+    def draw_icon(self, dest, name, position):
+        """Draw an atlas icon onto dest at position; returns the drawn Rect or None"""
+        return self.atlas.blit(dest, name, position)
     
     def list_loaded_images(self):
         """Return list of loaded image names"""
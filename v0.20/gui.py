@@ -1,16 +1,29 @@
+import logging
 import pygame
 import sys
+import time
 
 # Import our modular components
 from graphics_manager import GraphicsManager
 from ui_renderer import UIRenderer
 from button_manager import ButtonManager
 from game_state_manager import GameStateManager
+from events import EngineEvent
+from profiler import FrameProfiler
+
+# Posted to the pygame queue when the engine publishes an event, waking idle loops
+ENGINE_EVENT = pygame.event.custom_type()
+
+logger = logging.getLogger(__name__)
 
 
 class ClassBoardGameGUI:
     """Main GUI class that coordinates all components"""
     
+    # Engine calls timed by the frame profiler
+    PROFILED_ENGINE_CALLS = ("process_user_input", "update_actioncards", "trigger_cardEffect",
+                             "run_level_loop", "execute_command_directly", "undo", "redo")
+    
     def __init__(self, engine=None):
         pygame.init()
         
@@ -30,6 +43,66 @@ class ClassBoardGameGUI:
         
         # Input state
         self.mouse_pos = (0, 0)
+        
+        # Redraw only changed UI elements in runGUI_game (False: full redraw every frame)
+        self.dirty_rendering = True
+        
+        # Event-driven loops sleep in pygame.event.wait while nothing is animating
+        # (False: poll and redraw at FPS forever)
+        self.event_driven = True
+        self.FPS = 60
+        self.idle_timeout_ms = 1000  # fallback wake-up; engine events wake the loop immediately
+        self._animate_until = 0.0
+        
+        # Engine changes made elsewhere (e.g. another thread) wake the event loop
+        if self.engine is not None:
+            self.engine.events.subscribe(EngineEvent, self._on_engine_event)
+        
+        # Opt-in frame profiler (ODYSSEY_PROFILE=1 or F3): section timings, overlay, CSV trace at exit
+        self.profiler = FrameProfiler()
+        if self.engine is not None:
+            self.profiler.instrument(self.engine, self.PROFILED_ENGINE_CALLS, prefix="engine.")
+        self.renderer.profiler = self.profiler if self.profiler.enabled else None
+    
+    # =============================================================================
+    # FRAME PACING
+    # =============================================================================
+    
+    def start_animation(self, seconds):
+        """Run the GUI loops at full frame rate for the next seconds"""
+        self._animate_until = max(self._animate_until, time.monotonic() + seconds)
+    
+    @property
+    def is_animating(self):
+        """True while an animation needs frames at full rate"""
+        return time.monotonic() < self._animate_until
+    
+    def _toggle_profiling(self):
+        """Switch the frame profiler and its overlay on or off"""
+        enabled = self.profiler.toggle()
+        self.renderer.profiler = self.profiler if enabled else None
+    
+    def _on_engine_event(self, event):
+        """Wake a loop blocked in pygame.event.wait so it redraws the change"""
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(ENGINE_EVENT))
+    
+    def _next_events(self, clock):
+        """
+        Wait for the next batch of events
+        
+        Polls at FPS while animating or loading graphics (or with event_driven off);
+        otherwise blocks until input arrives or idle_timeout_ms passes. Redraws
+        triggered by input are still capped at FPS.
+        """
+        clock.tick(self.FPS)
+        if not self.event_driven or self.is_animating or self.graphics.is_loading:
+            return pygame.event.get()
+        
+        event = pygame.event.wait(self.idle_timeout_ms)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        return events
     
     def handle_button_click(self, pos):
         """Handle button click events"""
@@ -78,7 +151,7 @@ class ClassBoardGameGUI:
                 self.game_state.current_message = f"Cannot play {card_name} - invalid action or insufficient cards"
                 
         except Exception as e:
-            print(f"Error handling action card: {e}")
+            logger.error("Error handling action card: %s", e)
             self.game_state.current_message = f"Error playing {card_name}: {str(e)}"
     
     def _handle_action_card(self, card_name):
@@ -88,31 +161,37 @@ class ClassBoardGameGUI:
             result = self.game_state.engine.process_user_input(action_input)
             
             if result:
-                # Store current state before operations
-                cards_before = self.game_state.engine.actioncards_played
-                player_before = self.game_state.engine.activePlayerID
-                
                 # Update cards and trigger effects
                 card_result = self.game_state.engine.update_actioncards()
                 effect_result = self.game_state.engine.trigger_cardEffect()
                 
                 self.game_state.current_message = f"Played {card_name} card! Cards played this turn: {self.game_state.engine.actioncards_played}"
                 
-                # Let the engine handle turn switching logic
+                # Let the engine handle turn switching logic; a turn change is announced
+                # by GameStateManager's PlayerChanged handler
                 game_status = self.game_state.engine.run_level_loop()
-                
-                # Check if turn switched (counter reset means new player)
-                if (self.game_state.engine.actioncards_played == 0 and 
-                    self.game_state.engine.activePlayerID != player_before):
-                    self.game_state.current_message += f"\nTurn complete! Now Player {self.game_state.engine.activePlayerID}'s turn."
                     
             else:
                 self.game_state.current_message = f"Cannot play {card_name} - invalid action or insufficient cards"
                 
         except Exception as e:
-            print(f"Error handling action card: {e}")
+            logger.error("Error handling action card: %s", e)
             self.game_state.current_message = f"Error playing {card_name}: {str(e)}"
     
+    def _handle_take_back(self, key):
+        """Ctrl+Z takes back the last move, Ctrl+Y replays it"""
+        engine = self.game_state.engine
+        if key == pygame.K_z:
+            if engine.undo():
+                self.game_state.current_message = "Move taken back"
+            else:
+                self.game_state.current_message = "Nothing to take back"
+        elif key == pygame.K_y:
+            if engine.redo():
+                self.game_state.current_message = "Move replayed"
+            else:
+                self.game_state.current_message = "Nothing to replay"
+    
     def _show_player_cards(self):
         """Display current player's cards"""
         engine = self.game_state.engine
@@ -153,10 +232,10 @@ class ClassBoardGameGUI:
             
             
             self.game_state.engine.game_statusID = 1000
-            print(f"Game status changed to: {self.game_state.engine.game_statusID}")
+            logger.info("Game status changed to: %s", self.game_state.engine.game_statusID)
             
         except Exception as e:
-            print(f"Error starting game: {e}")
+            logger.error("Error starting game: %s", e)
             self.game_state.current_message = f"Error starting game: {str(e)}"
     
     def draw_action_buttons(self):
@@ -179,13 +258,78 @@ class ClassBoardGameGUI:
             hover = button_rect.collidepoint(self.mouse_pos)
             self.renderer.draw_button(button_rect, button_text, hover=hover)
     
+    def _queue_game_elements(self):
+        """Queue every game screen element with the inputs its look depends on"""
+        renderer = self.renderer
+        renderer.begin_frame()
+        
+        image = self.graphics.get_image("odysseus")
+        renderer.add_element("image_space", image, renderer.get_image_space_rect(), renderer.draw_image_space)
+        
+        status_text = self.game_state.get_status_text()
+        renderer.add_element("status", status_text, renderer.get_textbox_rect(status_text),
+                             lambda: renderer.draw_textbox(status_text))
+        
+        total_progress = self.game_state.get_total_progress()
+        renderer.add_element("progress", total_progress, renderer.get_progress_bar_rect(),
+                             lambda: renderer.draw_progress_bar(total_progress))
+        
+        actionpaths = self.game_state.get_actionpaths()
+        for path, path_name in enumerate(renderer.PATH_NAMES):
+            progress = actionpaths.get(path_name, 0)
+            renderer.add_element(("path", path), progress, renderer.get_path_rect(path),
+                                 lambda path=path, progress=progress: renderer.draw_path(path, progress))
+        
+        for i, button_text in enumerate(self.buttons.action_buttons):
+            button_rect = self.buttons.get_action_button_rect(i)
+            hover = button_rect.collidepoint(self.mouse_pos)
+            card_count = self.game_state.get_player_card_count(button_text)
+            
+            def draw_action_button(button_rect=button_rect, button_text=button_text, hover=hover,
+                                   card_count=card_count):
+                renderer.draw_button(button_rect, button_text, hover=hover)
+                if card_count > 0:
+                    renderer.draw_card_count(button_rect, card_count)
+            
+            renderer.add_element(("action", button_text), (hover, card_count), button_rect, draw_action_button)
+        
+        for i, button_text in enumerate(self.buttons.control_buttons):
+            button_rect = self.buttons.get_control_button_rect(i)
+            hover = button_rect.collidepoint(self.mouse_pos)
+            renderer.add_element(("control", button_text), hover, button_rect,
+                                 lambda button_rect=button_rect, button_text=button_text, hover=hover:
+                                 renderer.draw_button(button_rect, button_text, hover=hover))
+        
+        quit_rect = self.buttons.quit_button_rect
+        hover = quit_rect.collidepoint(self.mouse_pos)
+        renderer.add_element("quit", hover, quit_rect,
+                             lambda: renderer.draw_button(quit_rect, "QUIT", hover=hover))
+        
+        # Show start button only if game hasn't been started yet
+        if getattr(self.game_state.engine, 'game_statusID', 0) == 0:
+            start_rect = self.buttons.start_button_rect
+            start_hover = start_rect.collidepoint(self.mouse_pos)
+            renderer.add_element("start", start_hover, start_rect,
+                                 lambda: renderer.draw_button(start_rect, "START", hover=start_hover,
+                                                              text_color=(255, 0, 0), font=renderer.large_font))
+        
+        if self.profiler.enabled:
+            lines = self.profiler.overlay_lines()
+            renderer.add_element("profiler", tuple(lines), renderer.get_overlay_rect(lines),
+                                 lambda: renderer.draw_overlay(lines))
+    
     def runGUI_initialize_game(self):
         """Run the game initialization screen"""
         clock = pygame.time.Clock()
         running = True
+        redraw = True
+        
+        # Decode the graphics in the background while the start screen is up
+        self.graphics.preload()
         
         while running:
-            for event in pygame.event.get():
+            events = self._next_events(clock)
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                     pygame.quit()
@@ -202,6 +346,14 @@ class ClassBoardGameGUI:
                             self.game_state.engine.game_statusID == 1000):
                             running = False
             
+            # The start screen only changes in response to input or loading progress
+            loading = self.graphics.is_loading
+            if loading:
+                self.graphics.process_loaded()
+            if not (redraw or events or loading or self.is_animating or not self.event_driven):
+                continue
+            redraw = False
+            
             self.screen.fill(self.renderer.BACKGROUND_COLOR)
             self.renderer.draw_textbox("Click START to initialize the game\nwith 2 players and deal cards.")
             
@@ -214,18 +366,26 @@ class ClassBoardGameGUI:
             self.renderer.draw_button(self.buttons.start_button_rect, "START", hover=hover, 
                                     text_color=(255, 0, 0), font=self.renderer.large_font)
             
+            if self.graphics.is_loading:
+                self.renderer.draw_loading_bar(self.graphics.load_progress)
+            
             pygame.display.flip()
-            clock.tick(60)
     
     def runGUI_game(self):
         """Run the main game screen"""
         clock = pygame.time.Clock()
-        running = True
+        self.renderer.invalidate()
         
-        while running:
-            for event in pygame.event.get():
+        while True:
+            self._game_frame(self._next_events(clock))
+    
+    def _game_frame(self, events):
+        """Handle one batch of events and draw one game screen frame"""
+        profiler = self.profiler
+        profiler.begin_frame()
+        with profiler.section("events"):
+            for event in events:
                 if event.type == pygame.QUIT:
-                    running = False
                     pygame.quit()
                     sys.exit()
                 elif event.type == pygame.MOUSEMOTION:
@@ -233,28 +393,56 @@ class ClassBoardGameGUI:
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:
                         self.handle_button_click(event.pos)
-            
-            self.screen.fill(self.renderer.BACKGROUND_COLOR)
-            
-            # Draw all UI elements
+                elif (event.type == pygame.KEYDOWN and event.mod & pygame.KMOD_CTRL
+                      and event.key in (pygame.K_z, pygame.K_y)):
+                    self._handle_take_back(event.key)
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self._toggle_profiling()
+                elif event.type == pygame.WINDOWEXPOSED:
+                    self.renderer.invalidate()
+        
+        if self.dirty_rendering:
+            with profiler.section("queue elements"):
+                self._queue_game_elements()
+            with profiler.section("render"):
+                dirty_rects = self.renderer.end_frame()
+            if dirty_rects:
+                with profiler.section("display.update"):
+                    pygame.display.update(dirty_rects)
+            profiler.end_frame()
+            return
+        
+        self.screen.fill(self.renderer.BACKGROUND_COLOR)
+        
+        # Draw all UI elements
+        with profiler.section("draw image_space"):
             self.renderer.draw_image_space()
+        with profiler.section("draw status"):
             self.renderer.draw_textbox(self.game_state.get_status_text())
+        with profiler.section("draw progress"):
             self.renderer.draw_progress_bar(self.game_state.get_total_progress())
+        with profiler.section("draw path"):
             self.renderer.draw_paths(self.game_state.get_actionpaths())
-            
+        
+        with profiler.section("draw action"):
             self.draw_action_buttons()
+        with profiler.section("draw control"):
             self.draw_control_buttons()
-            
-            # Draw quit button (now in top right corner and smaller)
-            hover = self.buttons.quit_button_rect.collidepoint(self.mouse_pos)
-            self.renderer.draw_button(self.buttons.quit_button_rect, "QUIT", hover=hover)
-            
-            # Show start button if game isn't fully initialized
-            # Show start button only if game hasn't been started yet
-            if getattr(self.game_state.engine, 'game_statusID', 0) == 0:
-                hover = self.buttons.start_button_rect.collidepoint(self.mouse_pos)
-                self.renderer.draw_button(self.buttons.start_button_rect, "START", hover=hover,
-                                        text_color=(255, 0, 0), font=self.renderer.large_font)
-            
+        
+        # Draw quit button (now in top right corner and smaller)
+        hover = self.buttons.quit_button_rect.collidepoint(self.mouse_pos)
+        self.renderer.draw_button(self.buttons.quit_button_rect, "QUIT", hover=hover)
+        
+        # Show start button if game isn't fully initialized
+        # Show start button only if game hasn't been started yet
+        if getattr(self.game_state.engine, 'game_statusID', 0) == 0:
+            hover = self.buttons.start_button_rect.collidepoint(self.mouse_pos)
+            self.renderer.draw_button(self.buttons.start_button_rect, "START", hover=hover,
+                                    text_color=(255, 0, 0), font=self.renderer.large_font)
+        
+        if profiler.enabled:
+            self.renderer.draw_overlay(profiler.overlay_lines())
+        
+        with profiler.section("display.flip"):
             pygame.display.flip()
-            clock.tick(60)
\ No newline at end of file
+        profiler.end_frame()
\ No newline at end of file
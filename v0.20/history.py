@@ -0,0 +1,151 @@
+# history.py - Bounded undo/redo history of compact state deltas
+import sys
+from collections import deque
+from typing import Any, List, Optional, Tuple
+
+# A change is (target, key, old, new):
+#   ('state', field, old, new)        GameState attribute
+#   ('path', path_name, old, new)     GameState.action_paths entry
+#   (player_id, card_name, old, new)  Player.actioncards entry
+#   ('active', player_id, old, new)   Player.is_active
+#   ('played', player_id, old, new)   Player.actioncards_played
+Change = Tuple[Any, Any, Any, Any]
+
+
+class UndoHistory:
+    """
+    Undo/redo stacks of turn steps, each stored as a tuple of field changes.
+
+    A step only holds the fields it changed (a handful of tuples), so undo and
+    redo cost time proportional to the step, never to the size of the game.
+    The undo stack is a ring buffer: once max_bytes (and optionally max_steps)
+    is exceeded the oldest steps are dropped.
+    """
+
+    DEFAULT_MAX_BYTES = 1024 * 1024
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_steps: Optional[int] = None):
+        """
+        Args:
+            max_bytes: Approximate memory cap for the undo and redo stacks
+            max_steps: Optional cap on the number of undoable steps
+        """
+        self.max_bytes = max_bytes
+        self.max_steps = max_steps
+        self._undo = deque()      # (changes, size) tuples, oldest first
+        self._redo = []
+        self._current: Optional[List[Change]] = None
+        self.memory_usage = 0
+
+    # =============================================================================
+    # RECORDING
+    # =============================================================================
+
+    def begin(self) -> None:
+        """Start a new step; a new step makes the redo stack unreachable"""
+        self.commit()
+        self._current = []
+        if self._redo:
+            self.memory_usage -= sum(size for _, size in self._redo)
+            self._redo.clear()
+
+    def record(self, changes: List[Change]) -> None:
+        """Add changes to the current step (ignored when no step is open)"""
+        if self._current is not None:
+            self._current.extend(change for change in changes if change[2] != change[3])
+
+    def commit(self) -> None:
+        """Close the current step and push it onto the undo stack"""
+        if not self._current:
+            self._current = None
+            return
+
+        changes = tuple(self._current)
+        self._current = None
+        self._push(self._undo, changes, self._size(changes))
+        self._evict()
+
+    def clear(self) -> None:
+        """Forget all history"""
+        self._undo.clear()
+        self._redo.clear()
+        self._current = None
+        self.memory_usage = 0
+
+    @staticmethod
+    def _size(changes: Tuple[Change, ...]) -> int:
+        """Approximate bytes held by a step (the tuples; values are small shared objects)"""
+        return sys.getsizeof(changes) + sum(sys.getsizeof(change) for change in changes)
+
+    def _push(self, stack, changes, size) -> None:
+        stack.append((changes, size))
+        self.memory_usage += size
+
+    def _evict(self) -> None:
+        """Drop the oldest undo steps until the caps are respected"""
+        while self._undo and (self.memory_usage > self.max_bytes or
+                              (self.max_steps is not None and len(self._undo) > self.max_steps)):
+            _, size = self._undo.popleft()
+            self.memory_usage -= size
+
+    # =============================================================================
+    # UNDO / REDO
+    # =============================================================================
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._current) or bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def pop_undo(self) -> Optional[Tuple[Change, ...]]:
+        """Move the latest step to the redo stack and return its changes"""
+        self.commit()
+        if not self._undo:
+            return None
+        changes, size = self._undo.pop()
+        self._redo.append((changes, size))
+        return changes
+
+    def pop_redo(self) -> Optional[Tuple[Change, ...]]:
+        """Move the latest undone step back to the undo stack and return its changes"""
+        if not self._redo:
+            return None
+        changes, size = self._redo.pop()
+        self._undo.append((changes, size))
+        return changes
+
+    def __len__(self):
+        return len(self._undo) + (1 if self._current else 0)
+
+
+def read_value(engine, target, key) -> Any:
+    """Read the current value of a change target from the engine"""
+    if target == 'state':
+        return getattr(engine.state, key)
+    if target == 'path':
+        return engine.state.action_paths.get(key, 0)
+    if target == 'active':
+        return engine.get_player_by_id(key).is_active
+    if target == 'played':
+        return engine.get_player_by_id(key).actioncards_played
+    return engine.get_player_by_id(target).actioncards.get(key, 0)
+
+
+def apply_changes(engine, changes: Tuple[Change, ...], undo: bool) -> None:
+    """Write the old (undo) or new (redo) value of every change into the engine"""
+    state = engine.state
+    for target, key, old, new in (reversed(changes) if undo else changes):
+        value = old if undo else new
+        if target == 'state':
+            setattr(state, key, value)
+        elif target == 'path':
+            state.action_paths[key] = value
+        elif target == 'active':
+            engine.get_player_by_id(key).is_active = value
+        elif target == 'played':
+            engine.get_player_by_id(key).actioncards_played = value
+        else:
+            engine.get_player_by_id(target).actioncards[key] = value
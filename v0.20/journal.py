@@ -0,0 +1,169 @@
+# journal.py - Append-only command journal with keyframed replay
+import copy
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+class GameJournal:
+    """
+    Append-only journal of engine operations.
+
+    The engine records every accepted input, every turn step it runs
+    (update_actioncards, trigger_cardEffect, run_level_loop, nextPlayer),
+    commands run by name, state changes made through the legacy setters and
+    every random deal.
+    Replaying the operations on a fresh headless engine rebuilds GameState and
+    Player objects exactly; deals are replayed from the recorded hands, so no
+    RNG is needed.
+
+    Every keyframe_interval entries a full snapshot is stored, so replaying to
+    a position only applies the entries after the nearest keyframe.
+    """
+
+    def __init__(self, path: Optional[str] = None, keyframe_interval: int = 100):
+        """
+        Args:
+            path: Optional JSON Lines file the journal is appended to
+            keyframe_interval: Entries between keyframe snapshots
+        """
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.entries: List[Dict[str, Any]] = []
+        self.keyframes: Dict[int, Dict[str, Any]] = {}  # position -> snapshot before that entry
+        self._turn_positions: List[int] = []            # position of every accepted input
+        self._file = open(path, 'a') if path else None
+
+    # =============================================================================
+    # RECORDING
+    # =============================================================================
+
+    def record(self, entry: Dict[str, Any], snapshot: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Append an entry; the engine records each operation before running it
+
+        Args:
+            entry: Operation dictionary with an 'op' key
+            snapshot: Callable returning the engine state, used when a keyframe is due
+        """
+        position = len(self.entries)
+        if position % self.keyframe_interval == 0:
+            self.keyframes[position] = snapshot()
+            self._write({'type': 'keyframe', 'position': position, 'snapshot': self.keyframes[position]})
+
+        if entry['op'] == 'input':
+            self._turn_positions.append(position)
+        self.entries.append(entry)
+        self._write(entry)
+
+    def _write(self, line: Dict[str, Any]) -> None:
+        """Append one JSON line to the journal file"""
+        if self._file:
+            self._file.write(json.dumps(line, separators=(',', ':')) + "\n")
+
+    def flush(self) -> None:
+        """Flush buffered journal lines to disk"""
+        if self._file:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the journal file"""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @classmethod
+    def load(cls, path: str, keyframe_interval: int = 100) -> 'GameJournal':
+        """Read a journal file (the loaded journal is not appended to)"""
+        journal = cls(keyframe_interval=keyframe_interval)
+        with open(path, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if data.get('type') == 'keyframe':
+                    journal.keyframes[data['position']] = data['snapshot']
+                else:
+                    if data['op'] == 'input':
+                        journal._turn_positions.append(len(journal.entries))
+                    journal.entries.append(data)
+        return journal
+
+    def __len__(self):
+        return len(self.entries)
+
+    # =============================================================================
+    # REPLAY
+    # =============================================================================
+
+    def position_of_turn(self, turn: int) -> int:
+        """Journal position just before the (turn + 1)-th accepted input (end of journal if none)"""
+        if turn < len(self._turn_positions):
+            return self._turn_positions[turn]
+        return len(self.entries)
+
+    def replay(self, position: Optional[int] = None, turn: Optional[int] = None):
+        """
+        Rebuild the engine state after the first position entries (or after turn accepted inputs)
+
+        Replay runs on a quiet headless engine: no GUI, no logging, no file I/O.
+
+        Returns:
+            ClassGameEngine: Engine holding the rebuilt GameState and Player objects
+        """
+        from GameEngine import ClassGameEngine
+
+        if turn is not None:
+            position = self.position_of_turn(turn)
+        elif position is None:
+            position = len(self.entries)
+        position = min(position, len(self.entries))
+
+        engine = ClassGameEngine(headless=True, quiet=True)
+        start = max((keyframe for keyframe in self.keyframes if keyframe <= position), default=None)
+        if start is None:
+            start = 0
+        else:
+            restore_snapshot(engine, self.keyframes[start])
+
+        for entry in self.entries[start:position]:
+            apply_entry(engine, entry)
+        return engine
+
+
+def restore_snapshot(engine, snapshot: Dict[str, Any]) -> None:
+    """Load a keyframe snapshot into the engine (the snapshot itself is left untouched)"""
+    snapshot = copy.deepcopy(snapshot)
+    engine.state = engine.state_class.from_dict(snapshot['game_state'])
+    engine.players = [engine.player_class.from_dict(player_data, engine.card_manager)
+                      for player_data in snapshot['players'].values()]
+
+
+def apply_entry(engine, entry: Dict[str, Any]) -> None:
+    """Re-run one journaled operation on the engine"""
+    from gamestate import GameStatus
+
+    op = entry['op']
+    if op == 'input':
+        engine.process_user_input(entry['input'])
+    elif op == 'update':
+        engine.update_actioncards()
+    elif op == 'effect':
+        engine.trigger_cardEffect()
+    elif op == 'loop':
+        engine.run_level_loop()
+    elif op == 'next_player':
+        engine.nextPlayer()
+    elif op == 'init':
+        engine.initialize_game(entry['num_players'], deal_cards=False,
+                               starting_endurance=entry['starting_endurance'])
+    elif op == 'deal':
+        player = engine.get_player_by_id(entry['player_id'])
+        player.actioncards = dict(entry['actioncards'])
+    elif op == 'set':
+        value = GameStatus(entry['value']) if entry['field'] == 'status' else entry['value']
+        setattr(engine.state, entry['field'], value)
+    elif op == 'command':
+        engine.execute_command_directly(entry['name'])
+    elif op == 'snapshot':
+        restore_snapshot(engine, entry['snapshot'])
+    else:
+        raise ValueError(f"Unknown journal operation: {op}")
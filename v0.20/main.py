@@ -1,8 +1,15 @@
 # Main class
+import logging
+import os
 import pygame
 import sys
 
 def main():
+    # Engine and GUI modules log through the standard logging module
+    logging.basicConfig(level=os.environ.get("ODYSSEY_LOG_LEVEL", "INFO").upper(),
+                        format="%(message)s")
+    
+    engine = None
     try:
         # Import the GUI class
         from gui import ClassBoardGameGUI
@@ -47,6 +54,13 @@ def main():
         traceback.print_exc()
     finally:
         # Clean up
+        if engine is not None:
+            engine.flush()
+            
+            # Command counters and latency histograms for a Prometheus textfile collector
+            metrics_file = os.environ.get("ODYSSEY_METRICS_FILE")
+            if metrics_file and engine.command_manager.metrics is not None:
+                engine.command_manager.metrics.write_prometheus(metrics_file)
         try:
             pygame.quit()
         except:
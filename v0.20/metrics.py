@@ -0,0 +1,134 @@
+# metrics.py - Command execution counters and latency histograms
+import os
+import tempfile
+from bisect import bisect_left
+from typing import Any, Dict, Optional
+
+# Upper bounds (seconds) of the latency histogram buckets; an implicit +Inf bucket follows
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 1e-2)
+
+
+class _CommandStats:
+    """Counters and latency histogram of one command type"""
+
+    __slots__ = ('executed', 'rejected', 'latency_sum', 'bucket_counts')
+
+    def __init__(self, bucket_count: int):
+        self.executed = 0
+        self.rejected = 0
+        self.latency_sum = 0.0
+        self.bucket_counts = [0] * (bucket_count + 1)
+
+
+class CommandMetrics:
+    """
+    Per command type execution counts, rejections and latency histograms.
+
+    Commands are labelled by Command.metric_name ('quit', 'skip', 'play_card',
+    ...). For engine input the latency spans the whole input, from parsing
+    until run_level_loop finishes it; CommandManager.execute_command alone
+    times just the command. observe() costs one bisect and a few integer
+    updates; set CommandManager.metrics to None to switch instrumentation off.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.commands: Dict[str, _CommandStats] = {}
+        self.invalid_inputs = 0     # inputs that matched no command
+
+    def _stats(self, name: str) -> _CommandStats:
+        stats = self.commands.get(name)
+        if stats is None:
+            stats = self.commands[name] = _CommandStats(len(self.buckets))
+        return stats
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Count an executed command and its latency"""
+        stats = self.commands.get(name) or self._stats(name)
+        stats.executed += 1
+        stats.latency_sum += seconds
+        stats.bucket_counts[bisect_left(self.buckets, seconds)] += 1
+
+    def reject(self, name: str) -> None:
+        """Count a command refused by can_execute"""
+        self._stats(name).rejected += 1
+
+    def reset(self) -> None:
+        """Forget all counts"""
+        self.commands.clear()
+        self.invalid_inputs = 0
+
+    # =============================================================================
+    # EXPORT
+    # =============================================================================
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Copy of the current counts
+
+        Returns:
+            dict: {'invalid_inputs': n, 'commands': {name: {'executed', 'rejected',
+                  'latency_sum', 'buckets': {upper bound: cumulative count, ..., 'inf': n}}}}
+        """
+        commands = {}
+        for name, stats in sorted(self.commands.items()):
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(self.buckets + ('inf',), stats.bucket_counts):
+                cumulative += count
+                buckets[bound] = cumulative
+            commands[name] = {
+                'executed': stats.executed,
+                'rejected': stats.rejected,
+                'latency_sum': stats.latency_sum,
+                'buckets': buckets
+            }
+        return {'invalid_inputs': self.invalid_inputs, 'commands': commands}
+
+    def to_prometheus(self, prefix: str = "odyssey_command") -> str:
+        """Render the counts in the Prometheus text exposition format (version 0.0.4)"""
+        snapshot = self.snapshot()
+        commands = snapshot['commands']
+        lines = [
+            f"# HELP {prefix}_executed_total Commands executed, by command type",
+            f"# TYPE {prefix}_executed_total counter",
+        ]
+        lines += [f'{prefix}_executed_total{{command="{name}"}} {stats["executed"]}'
+                  for name, stats in commands.items()]
+        lines += [
+            f"# HELP {prefix}_rejected_total Commands refused by can_execute, by command type",
+            f"# TYPE {prefix}_rejected_total counter",
+        ]
+        lines += [f'{prefix}_rejected_total{{command="{name}"}} {stats["rejected"]}'
+                  for name, stats in commands.items()]
+        lines += [
+            f"# HELP {prefix}_invalid_inputs_total Inputs that matched no command",
+            f"# TYPE {prefix}_invalid_inputs_total counter",
+            f"{prefix}_invalid_inputs_total {snapshot['invalid_inputs']}",
+            f"# HELP {prefix}_latency_seconds Command execution latency",
+            f"# TYPE {prefix}_latency_seconds histogram",
+        ]
+        for name, stats in commands.items():
+            for bound, count in stats['buckets'].items():
+                le = "+Inf" if bound == 'inf' else repr(bound)
+                lines.append(f'{prefix}_latency_seconds_bucket{{command="{name}",le="{le}"}} {count}')
+            lines.append(f'{prefix}_latency_seconds_sum{{command="{name}"}} {stats["latency_sum"]!r}')
+            lines.append(f'{prefix}_latency_seconds_count{{command="{name}"}} {stats["executed"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "odyssey_command") -> None:
+        """Atomically write to_prometheus() to a file (e.g. for a node_exporter textfile collector)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as metrics_file:
+                metrics_file.write(self.to_prometheus(prefix))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def command_metric_name(command) -> str:
+    """Metric label of a command (its metric_name, or the class name)"""
+    return getattr(command, 'metric_name', None) or type(command).__name__
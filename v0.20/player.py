@@ -1,11 +1,13 @@
-from actioncard import ActionCardManager
+from types import MappingProxyType
+from actioncard import ActionCardManager, ArrayHand
+from gamestate import VersionedDict, bump_version
 
 class Player:
     """
     Handles all player-specific data and operations
     """
     
-    def __init__(self, player_id, starting_endurance=15, card_manager=None):
+    def __init__(self, player_id, starting_endurance=15, card_manager=None, array_hand=False):
         self.player_id = player_id
         self.endurance = starting_endurance
         self.is_active = False
@@ -14,14 +16,36 @@ class Player:
         # Use provided card manager or create default one
         self.card_manager = card_manager if card_manager else ActionCardManager()
         
+        # Array-backed hands store counts in an int array instead of a dict
+        self.array_hand = array_hand
+        
         # Initialize actioncards dictionary with all available cards
         self._initialize_actioncards()
     
+    @property
+    def hand_view(self):
+        """Read-only, zero-copy view of actioncards"""
+        return MappingProxyType(self.actioncards)
+    
     def _initialize_actioncards(self):
         """Initialize actioncards dictionary with all available card types set to 0"""
+        if self.array_hand:
+            self.actioncards = ArrayHand(self.card_manager.get_card_index())
+            return
         card_names = self.card_manager.get_all_card_names()
         self.actioncards = {card_name: 0 for card_name in card_names}
     
+    def set_hand_counts(self, counts):
+        """
+        Use an int array of card counts as this player's hand (array hand mode)
+        
+        Args:
+            counts: Array indexed by card_manager.get_card_index(), e.g. one row
+                    of ActionCardManager.deal_card_table. It is used without copying.
+        """
+        self.array_hand = True
+        self.actioncards = ArrayHand(self.card_manager.get_card_index(), counts)
+    
     # =============================================================================
     # CARD MANAGEMENT
     # =============================================================================
@@ -44,7 +68,7 @@ class Player:
                 self.actioncards[card_name] += count
             else:
                 # Handle case where new card types are added to card manager
-                self.actioncards[card_name] = count
+                self._add_new_card(card_name, count)
         
         return self.actioncards
     
@@ -83,6 +107,8 @@ class Player:
     
     def get_total_cards(self):
         """Get total number of cards in player's hand"""
+        if self.array_hand:
+            return self.actioncards.total()
         return sum(self.actioncards.values())
     
     def get_playable_cards(self):
@@ -100,7 +126,14 @@ class Player:
         if card_name in self.actioncards:
             self.actioncards[card_name] += count
         else:
-            self.actioncards[card_name] = count
+            self._add_new_card(card_name, count)
+    
+    def _add_new_card(self, card_name, count):
+        """Put a card type the hand has no slot for yet into the hand"""
+        if self.array_hand:
+            # The array has one slot per card known when it was created; grow it to the current index
+            self.actioncards.extend(self.card_manager.get_card_index())
+        self.actioncards[card_name] = count
     
     def remove_card(self, card_name, count=1):
         """
@@ -160,13 +193,14 @@ class Player:
         }
     
     @classmethod
-    def from_dict(cls, data, card_manager=None):
+    def from_dict(cls, data, card_manager=None, array_hand=False):
         """
         Create Player instance from dictionary data
         
         Args:
             data: Dictionary containing player data
             card_manager: ActionCardManager instance (optional)
+            array_hand: Store the loaded hand as an int array (optional)
             
         Returns:
             Player: New Player instance with loaded data
@@ -174,11 +208,17 @@ class Player:
         player = cls(
             player_id=data['playerID'], 
             starting_endurance=data.get('endurance', 15),
-            card_manager=card_manager
+            card_manager=card_manager,
+            array_hand=array_hand
         )
         
         # Load saved state
-        player.actioncards = data.get('actioncards', {})
+        if array_hand:
+            for card_name, count in data.get('actioncards', {}).items():
+                if card_name in player.actioncards:
+                    player.actioncards[card_name] = count
+        else:
+            player.actioncards = data.get('actioncards', {})
         player.actioncards_played = data.get('actioncards_played', 0)
         player.is_active = data.get('activePlayer', False)
         
@@ -218,4 +258,22 @@ class Player:
             if count > 0:
                 info.append(f"    {card_name}: {count}")
         
-        return "\n".join(info)
\ No newline at end of file
+        return "\n".join(info)
+
+
+class VersionedPlayer(Player):
+    """
+    Player that stamps a global version (see gamestate.next_version) on every
+    change, including in-place edits of its hand, so readers can cache derived values.
+    """
+    
+    def __setattr__(self, name, value):
+        if name == 'actioncards':
+            # Hands report in-place edits by bumping the owner's version
+            if isinstance(value, ArrayHand):
+                value.owner = self
+            elif not (isinstance(value, VersionedDict) and value.owner is self):
+                value = VersionedDict(value, self)
+        object.__setattr__(self, name, value)
+        if name != 'version':
+            bump_version(self)
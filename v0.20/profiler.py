@@ -0,0 +1,251 @@
+# profiler.py - Opt-in per-frame timing of GUI render sections and engine calls
+import atexit
+import csv
+import functools
+import logging
+import math
+import os
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _NullSection:
+    """Context manager that does nothing (returned while profiling is off)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+_MISSING = object()
+
+
+class _Section:
+    """Times one with-block and adds it to the profiler's current frame"""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class FrameProfiler:
+    """
+    Per-frame timings of named sections with rolling percentiles and a CSV trace.
+
+    Wrap frame work in begin_frame()/end_frame() and each part in
+    `with profiler.section(name):`. A section used several times in a frame
+    (e.g. one per button) is summed. The last `window` frames of every section
+    feed the p50/p95/p99 shown by overlay_lines(); every frame is also kept in
+    a trace (up to max_trace_frames) that dump_csv() writes, by default when
+    the program exits.
+
+    While disabled, section() returns a shared no-op context manager, so
+    instrumented code costs one method call per section, and methods passed
+    to instrument() are left unwrapped.
+    """
+
+    ENV_VAR = "ODYSSEY_PROFILE"
+    QUANTILES = (50, 95, 99)
+
+    def __init__(self, enabled: Optional[bool] = None, window: int = 600,
+                 csv_path: Optional[str] = "frame_profile.csv", max_trace_frames: int = 100000,
+                 overlay_interval: float = 0.5):
+        """
+        Args:
+            enabled: Start enabled; None reads the ODYSSEY_PROFILE environment variable
+            window: Frames the rolling percentiles are computed over
+            csv_path: File the trace is written to on exit (None: no automatic dump)
+            max_trace_frames: Frames kept for the CSV trace (oldest dropped first)
+            overlay_interval: Seconds between overlay text refreshes
+        """
+        if enabled is None:
+            enabled = os.environ.get(self.ENV_VAR, "0") not in ("", "0")
+        self.window = window
+        self.csv_path = csv_path
+        self.overlay_interval = overlay_interval
+        self.enabled = False
+
+        self.samples: Dict[str, deque] = {}     # section -> seconds of the last window frames
+        self.trace = deque(maxlen=max_trace_frames)
+        self.frame = 0
+        self._current: Dict[str, float] = {}
+        self._frame_start = None
+        self._overlay_lines: List[str] = []
+        self._overlay_time = 0.0
+        self._exit_dump_registered = False
+        self._instrumented: List[Tuple[object, str, str]] = []     # (object, method name, section)
+        self._originals: Dict[Tuple[int, str], object] = {}         # instance attributes replaced by wrappers
+
+        if enabled:
+            self.enable()
+
+    # =============================================================================
+    # SWITCHING
+    # =============================================================================
+
+    def enable(self) -> None:
+        """Start collecting timings (the CSV trace is dumped at exit from now on)"""
+        if self.enabled:
+            return
+        self.enabled = True
+        for obj, name, section in self._instrumented:
+            self._wrap(obj, name, section)
+        if self.csv_path and not self._exit_dump_registered:
+            atexit.register(self._dump_at_exit)
+            self._exit_dump_registered = True
+
+    def disable(self) -> None:
+        """Stop collecting timings and restore instrumented methods; collected data is kept"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._frame_start = None
+        for obj, name, _ in self._instrumented:
+            self._unwrap(obj, name)
+
+    def toggle(self) -> bool:
+        """Switch profiling on or off; returns the new state"""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    # =============================================================================
+    # RECORDING
+    # =============================================================================
+
+    def section(self, name: str):
+        """Context manager timing a block as part of the current frame"""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to a section of the current frame"""
+        current = self._current
+        current[name] = current.get(name, 0.0) + seconds
+
+    def begin_frame(self) -> None:
+        """Start timing a frame"""
+        if self.enabled:
+            self._current = {}
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        """Finish the frame: store its section times under 'frame' (total) and each section name"""
+        if not self.enabled or self._frame_start is None:
+            return
+        current = self._current
+        current['frame'] = time.perf_counter() - self._frame_start
+        for name, seconds in current.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+        self.trace.append((self.frame, current))
+        self.frame += 1
+        self._current = {}
+        self._frame_start = None
+
+    def instrument(self, obj, method_names: Iterable[str], prefix: str = "") -> None:
+        """
+        Time calls to obj's methods as sections named prefix + method name
+
+        The wrappers are instance attributes, so only this object is affected.
+        They are installed while profiling is enabled and removed by disable().
+        """
+        for name in method_names:
+            self._instrumented.append((obj, name, prefix + name))
+            if self.enabled:
+                self._wrap(obj, name, prefix + name)
+
+    def _wrap(self, obj, name: str, section: str) -> None:
+        self._originals[id(obj), name] = vars(obj).get(name, _MISSING)
+        method = getattr(obj, name)
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            with self.section(section):
+                return method(*args, **kwargs)
+
+        setattr(obj, name, timed)
+
+    def _unwrap(self, obj, name: str) -> None:
+        original = self._originals.pop((id(obj), name), _MISSING)
+        if original is _MISSING:
+            delattr(obj, name)
+        else:
+            setattr(obj, name, original)
+
+    # =============================================================================
+    # REPORTING
+    # =============================================================================
+
+    def percentiles(self, name: str, quantiles: Tuple[int, ...] = QUANTILES) -> Optional[Tuple[float, ...]]:
+        """Nearest-rank percentiles (seconds) of a section over the rolling window"""
+        samples = self.samples.get(name)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return tuple(ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)] for q in quantiles)
+
+    def summary(self) -> Dict[str, Tuple[float, ...]]:
+        """{section: (p50, p95, p99)} in seconds, the frame total first, then slowest p95 first"""
+        result = {name: self.percentiles(name) for name in self.samples}
+        return dict(sorted(result.items(), key=lambda item: (item[0] != 'frame', -item[1][1])))
+
+    def overlay_lines(self) -> List[str]:
+        """Overlay text lines, refreshed at most every overlay_interval seconds"""
+        now = time.monotonic()
+        if now - self._overlay_time >= self.overlay_interval:
+            self._overlay_time = now
+            self._overlay_lines = [f"{'section':<22}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+            self._overlay_lines += [f"{name[:22]:<22}" + "".join(f"{value * 1000:7.2f}" for value in values)
+                                    for name, values in self.summary().items()]
+        return self._overlay_lines
+
+    def dump_csv(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Write the trace as CSV: one row per frame, one column per section (milliseconds)
+
+        Returns:
+            str or None: The path written, or None if there was nothing to write
+        """
+        path = path or self.csv_path
+        if not path or not self.trace:
+            return None
+
+        sections = sorted({name for _, frame in self.trace for name in frame} - {'frame'})
+        with open(path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['frame', 'frame_ms'] + [f"{name}_ms" for name in sections])
+            for number, frame in self.trace:
+                writer.writerow([number, f"{frame['frame'] * 1000:.4f}"] +
+                                [f"{frame[name] * 1000:.4f}" if name in frame else "" for name in sections])
+        logger.info("Frame profile written to '%s' (%d frames)", path, len(self.trace))
+        return path
+
+    def _dump_at_exit(self) -> None:
+        try:
+            self.dump_csv()
+        except OSError as e:
+            logger.warning("Could not write frame profile: %s", e)
@@ -0,0 +1,223 @@
+# serializers.py - Save file formats for PersistenceManager
+import json
+import lzma
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+# Files in a non-default format start with MAGIC + codec byte + compression byte.
+# Plain JSON saves have no header, so existing save files keep loading unchanged.
+MAGIC = b"ODY\x01"
+HEADER_SIZE = len(MAGIC) + 2
+
+COMPRESSORS = {
+    None: (b"-", None, None),
+    'zlib': (b"z", zlib.compress, zlib.decompress),
+    'lzma': (b"x", lzma.compress, lzma.decompress),
+}
+
+
+class SaveSerializer(ABC):
+    """Abstract base class for save file codecs"""
+
+    codec = b"?"
+
+    @abstractmethod
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        """Encode save data to bytes"""
+        pass
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        """Decode save data from bytes"""
+        pass
+
+
+class JsonSerializer(SaveSerializer):
+    """JSON codec; indent=None writes compact JSON without whitespace"""
+
+    codec = b"j"
+
+    def __init__(self, indent: Optional[int] = 4):
+        self.indent = indent
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        if self.indent is None:
+            return json.dumps(data, separators=(',', ':')).encode('utf-8')
+        return json.dumps(data, indent=self.indent).encode('utf-8')
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        return json.loads(payload)
+
+
+class BinarySerializer(SaveSerializer):
+    """
+    Compact tagged binary codec for JSON-like data.
+
+    Every distinct string (card names, dictionary keys, ...) is stored once in a
+    string table and referenced by integer index, so a hand like
+    {"battle": 2, "2x battle": 0, ...} costs two small varints per card instead
+    of the card name repeated for every player. Integers are zigzag varints.
+    """
+
+    codec = b"b"
+
+    _NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _LIST, _DICT = range(8)
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        strings = {}
+        body = bytearray()
+        self._encode(data, body, strings)
+
+        out = bytearray()
+        self._write_varint(out, len(strings))
+        for text in strings:  # dicts keep insertion order, which matches the indices
+            raw = text.encode('utf-8')
+            self._write_varint(out, len(raw))
+            out += raw
+        return bytes(out + body)
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        view = memoryview(payload)
+        count, pos = self._read_varint(view, 0)
+        strings = []
+        for _ in range(count):
+            length, pos = self._read_varint(view, pos)
+            strings.append(bytes(view[pos:pos + length]).decode('utf-8'))
+            pos += length
+        value, _ = self._decode(view, pos, strings)
+        return value
+
+    # -------------------------------------------------------------------------
+    # Encoding
+    # -------------------------------------------------------------------------
+
+    def _encode(self, value, out: bytearray, strings: Dict[str, int]) -> None:
+        if value is None:
+            out.append(self._NONE)
+        elif value is True:
+            out.append(self._TRUE)
+        elif value is False:
+            out.append(self._FALSE)
+        elif isinstance(value, int):
+            out.append(self._INT)
+            self._write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif isinstance(value, float):
+            out.append(self._FLOAT)
+            out += struct.pack('<d', value)
+        elif isinstance(value, str):
+            out.append(self._STR)
+            self._write_varint(out, strings.setdefault(value, len(strings)))
+        elif isinstance(value, (list, tuple)):
+            out.append(self._LIST)
+            self._write_varint(out, len(value))
+            for item in value:
+                self._encode(item, out, strings)
+        elif isinstance(value, dict):
+            out.append(self._DICT)
+            self._write_varint(out, len(value))
+            for key, item in value.items():
+                self._write_varint(out, strings.setdefault(str(key), len(strings)))
+                self._encode(item, out, strings)
+        else:
+            raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+    @staticmethod
+    def _write_varint(out: bytearray, number: int) -> None:
+        while number > 0x7f:
+            out.append((number & 0x7f) | 0x80)
+            number >>= 7
+        out.append(number)
+
+    # -------------------------------------------------------------------------
+    # Decoding
+    # -------------------------------------------------------------------------
+
+    def _decode(self, view, pos: int, strings: list):
+        tag = view[pos]
+        pos += 1
+        if tag == self._NONE:
+            return None, pos
+        if tag == self._TRUE:
+            return True, pos
+        if tag == self._FALSE:
+            return False, pos
+        if tag == self._INT:
+            number, pos = self._read_varint(view, pos)
+            return (number >> 1) ^ -(number & 1), pos
+        if tag == self._FLOAT:
+            return struct.unpack_from('<d', view, pos)[0], pos + 8
+        if tag == self._STR:
+            index, pos = self._read_varint(view, pos)
+            return strings[index], pos
+        if tag == self._LIST:
+            length, pos = self._read_varint(view, pos)
+            items = []
+            for _ in range(length):
+                item, pos = self._decode(view, pos, strings)
+                items.append(item)
+            return items, pos
+        if tag == self._DICT:
+            length, pos = self._read_varint(view, pos)
+            result = {}
+            for _ in range(length):
+                index, pos = self._read_varint(view, pos)
+                result[strings[index]], pos = self._decode(view, pos, strings)
+            return result, pos
+        raise ValueError(f"Unknown tag {tag} at offset {pos - 1}")
+
+    @staticmethod
+    def _read_varint(view, pos: int):
+        number = 0
+        shift = 0
+        while True:
+            byte = view[pos]
+            pos += 1
+            number |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return number, pos
+            shift += 7
+
+
+SERIALIZERS = {
+    JsonSerializer.codec: JsonSerializer,
+    BinarySerializer.codec: BinarySerializer,
+}
+
+
+def encode_save(data: Dict[str, Any], serializer: SaveSerializer, compression: Optional[str] = None) -> bytes:
+    """Encode save data; uncompressed JSON is written header-less (the legacy format)"""
+    if compression not in COMPRESSORS:
+        raise ValueError(f"Unknown compression: {compression}")
+
+    payload = serializer.dumps(data)
+    if compression is None and isinstance(serializer, JsonSerializer):
+        return payload
+
+    compression_byte, compress, _ = COMPRESSORS[compression]
+    if compress:
+        payload = compress(payload)
+    return MAGIC + serializer.codec + compression_byte + payload
+
+
+def decode_save(raw: bytes) -> Dict[str, Any]:
+    """Decode save data, detecting format and compression from the file header"""
+    if not raw.startswith(MAGIC):
+        return json.loads(raw)
+
+    codec = raw[len(MAGIC):len(MAGIC) + 1]
+    compression_byte = raw[len(MAGIC) + 1:HEADER_SIZE]
+    payload = raw[HEADER_SIZE:]
+
+    for byte, _, decompress in COMPRESSORS.values():
+        if byte == compression_byte:
+            if decompress:
+                payload = decompress(payload)
+            break
+    else:
+        raise ValueError(f"Unknown compression byte {compression_byte!r}")
+
+    if codec not in SERIALIZERS:
+        raise ValueError(f"Unknown save codec {codec!r}")
+    return SERIALIZERS[codec]().loads(payload)
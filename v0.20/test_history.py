@@ -0,0 +1,44 @@
+# test_history.py - State set outside the turn flow is its own undo step
+from GameEngine import ClassGameEngine
+from history import UndoHistory
+
+
+def _started_engine():
+    engine = ClassGameEngine(headless=True, seed=0, undo_history=UndoHistory())
+    engine.initialize_game(2)
+    engine.game_statusID = 1000
+    return engine
+
+
+def _play_first_card(engine):
+    player = engine.get_active_player()
+    card = engine.card_manager.get_card(player.get_playable_cards()[0])
+    assert engine.play_input(card.keywords[0])
+
+
+def test_set_state_after_undo_drops_redo():
+    engine = _started_engine()
+    paths_before = engine.state.action_paths.copy()
+    _play_first_card(engine)
+    assert engine.undo()
+
+    engine.roundcounter = 5
+
+    assert not engine.redo()
+    assert engine.state.round_counter == 5
+    assert engine.state.action_paths == paths_before
+
+
+def test_set_state_is_not_merged_into_the_previous_step():
+    engine = _started_engine()
+    paths_before = engine.state.action_paths.copy()
+    _play_first_card(engine)
+    paths_played = engine.state.action_paths.copy()
+
+    engine.roundcounter = 5
+
+    assert engine.undo()
+    assert engine.state.round_counter == 1
+    assert engine.state.action_paths == paths_played
+    assert engine.undo()
+    assert engine.state.action_paths == paths_before
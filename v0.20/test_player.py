@@ -0,0 +1,46 @@
+# test_player.py - Array hands must accept cards registered after they were created
+import pytest
+
+from actioncard import ActionCardManager
+from player import Player
+
+pytest.importorskip("numpy")
+
+
+def test_array_hand_add_card_registered_later():
+    card_manager = ActionCardManager()
+    player = Player(1, card_manager=card_manager, array_hand=True)
+    player.add_card('battle', 2)
+
+    card_manager.add_card('dragon', ['dragon'], {'battle': 3})
+    player.add_card('dragon')
+
+    assert player.get_card_count('dragon') == 1
+    assert player.get_card_count('battle') == 2
+    assert player.get_total_cards() == 3
+
+
+def test_array_hand_deal_cards_registered_later():
+    card_manager = ActionCardManager()
+    player = Player(1, card_manager=card_manager, array_hand=True)
+    card_manager.add_card('dragon', ['dragon'], {'battle': 3})
+    card_manager.deal_random_cards = lambda num_cards: {'dragon': num_cards}
+
+    player.deal_cards(4)
+
+    assert player.get_card_count('dragon') == 4
+    assert player.get_total_cards() == 4
+
+
+def test_array_hand_row_view_is_copied_when_extended():
+    card_manager = ActionCardManager()
+    table = card_manager.deal_card_table(1, 1, seed=0)
+    player = Player(1, card_manager=card_manager)
+    player.set_hand_counts(table[0, 0])
+
+    card_manager.add_card('dragon', ['dragon'], {'battle': 3})
+    player.add_card('dragon')
+
+    assert player.get_total_cards() == 7
+    assert table.sum() == 6
+
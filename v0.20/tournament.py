@@ -0,0 +1,111 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from GameEngine import ClassGameEngine, random_policy
+
+class TournamentRunner:
+    """
+    Fans seeded headless games out across a process pool and streams results back.
+
+    Games are sent to workers in batches of seeds so inter-process traffic stays
+    small compared to the simulation work, which keeps scaling close to linear.
+    The policy must be a module-level function so it can be pickled.
+    """
+
+    def __init__(self, workers=None, batch_size=250, policy=None, **game_kwargs):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.policy = policy or random_policy
+        self.game_kwargs = game_kwargs
+
+    def _seed_batches(self, num_games, seed):
+        """Split seeds seed .. seed+num_games-1 into (first_seed, count) batches"""
+        batches = []
+        for first_seed in range(seed, seed + num_games, self.batch_size):
+            count = min(self.batch_size, seed + num_games - first_seed)
+            batches.append((first_seed, count))
+        return batches
+
+    def run(self, num_games, seed=0):
+        """
+        Play num_games games and yield each result as its batch completes
+
+        Args:
+            num_games: Number of games to play
+            seed: Seed of the first game
+
+        Yields:
+            dict: Game result (seed, winner, scores, rounds, turns, moves, action_paths, cards_remaining)
+        """
+        batches = self._seed_batches(num_games, seed)
+
+        if self.workers == 1:
+            for first_seed, count in batches:
+                yield from play_game_batch(first_seed, count, self.policy, self.game_kwargs)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(play_game_batch, first_seed, count, self.policy, self.game_kwargs)
+                       for first_seed, count in batches]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    def run_summary(self, num_games, seed=0):
+        """
+        Play num_games games and return aggregated statistics
+
+        Returns:
+            dict: Win counts, average rounds and throughput
+        """
+        start = time.perf_counter()
+        wins = {}
+        total_rounds = 0
+        total_turns = 0
+
+        for result in self.run(num_games, seed):
+            wins[result['winner']] = wins.get(result['winner'], 0) + 1
+            total_rounds += result['rounds']
+            total_turns += result['turns']
+
+        elapsed = time.perf_counter() - start
+        return {
+            'games': num_games,
+            'workers': self.workers,
+            'wins': wins,
+            'average_rounds': total_rounds / num_games if num_games else 0.0,
+            'elapsed': elapsed,
+            'games_per_second': num_games / elapsed if elapsed > 0 else 0.0,
+            'turns_per_second': total_turns / elapsed if elapsed > 0 else 0.0
+        }
+
+
+def play_game_batch(first_seed, count, policy, game_kwargs):
+    """Worker entry point: play count games with consecutive seeds"""
+    results = []
+    for game_seed in range(first_seed, first_seed + count):
+        engine = ClassGameEngine(headless=True, seed=game_seed)
+        result = engine.run_headless_game(policy, **game_kwargs)
+        result['seed'] = game_seed
+        results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a headless Odyssey tournament")
+    parser.add_argument("games", type=int, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--players", type=int, default=2, help="players per game")
+    args = parser.parse_args()
+
+    runner = TournamentRunner(workers=args.workers, num_players=args.players)
+    summary = runner.run_summary(args.games, seed=args.seed)
+
+    print(f"Played {summary['games']} games on {summary['workers']} workers in {summary['elapsed']:.2f}s")
+    print(f"{summary['games_per_second']:.0f} games/s, {summary['turns_per_second']:.0f} turns/s")
+    print(f"Average rounds: {summary['average_rounds']:.2f}")
+    for winner, count in sorted(summary['wins'].items(), key=lambda item: str(item[0])):
+        label = f"Player {winner}" if winner is not None else "Tie"
+        print(f"  {label}: {count}")
@@ -1,9 +1,115 @@
 import pygame
+from collections import OrderedDict
+
+class TextSurfaceCache:
+    """
+    LRU cache of rendered text surfaces keyed by (font, text, color, antialias).
+    
+    Surfaces are evicted least recently used first once their pixel memory
+    exceeds max_bytes. A max_bytes of 0 disables caching.
+    """
+    
+    DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+    
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._surfaces = OrderedDict()
+        self.memory_usage = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def render(self, font, text, color, antialias=True):
+        """Return the rendered surface for text, rendering it only on a cache miss"""
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        size = surface.get_pitch() * surface.get_height()
+        if size > self.max_bytes:
+            return surface
+        
+        self._surfaces[key] = surface
+        self.memory_usage += size
+        while self.memory_usage > self.max_bytes:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.memory_usage -= evicted.get_pitch() * evicted.get_height()
+        return surface
+    
+    def size(self, font, text, color=(0, 0, 0), antialias=True):
+        """Size of the rendered text (measured from the cached surface)"""
+        return self.render(font, text, color, antialias).get_size()
+    
+    def clear(self):
+        """Drop all cached surfaces"""
+        self._surfaces.clear()
+        self.memory_usage = 0
+    
+    def __len__(self):
+        return len(self._surfaces)
+
+class BoardLayer:
+    """
+    Static part of the board rendered once off-screen: empty progress cells,
+    path labels and empty path circles.
+    
+    Per frame the renderer blits this layer and then only the filled markers,
+    using the pre-rendered cell and circle sprites.
+    """
+    
+    MARKER_RADIUS = 15
+    MARKER_SIZE = 2 * MARKER_RADIUS + 3
+    
+    def __init__(self, renderer, key):
+        self.key = key
+        self.rect = renderer.get_progress_bar_rect().unionall(
+            [renderer.get_path_rect(path) for path in range(len(renderer.PATH_NAMES))])
+        
+        # Draw the empty board with the renderer's own drawing code
+        board = pygame.Surface((renderer.WIDTH, renderer.HEIGHT))
+        board.fill(renderer.BACKGROUND_COLOR)
+        screen = renderer.screen
+        renderer.screen = board
+        try:
+            renderer._draw_progress_cells(0)
+            for path in range(len(renderer.PATH_NAMES)):
+                renderer._draw_path_shapes(path, 0)
+        finally:
+            renderer.screen = screen
+        
+        self.rect = self.rect.clip(board.get_rect())
+        self.surface = board.subsurface(self.rect).copy()
+        
+        # Filled progress cell: 1px black border around the fill color
+        cell_width = renderer.WIDTH // 20
+        self.cell_sprite = pygame.Surface((cell_width, 20))
+        self.cell_sprite.fill((0, 0, 0))
+        self.cell_sprite.fill((0, 255, 0), (1, 1, cell_width - 2, 18))
+        
+        # Filled circle per path, centered at (MARKER_RADIUS + 1, MARKER_RADIUS + 1)
+        center = (self.MARKER_RADIUS + 1, self.MARKER_RADIUS + 1)
+        self.marker_sprites = []
+        for color in renderer.PATH_COLORS:
+            marker = pygame.Surface((self.MARKER_SIZE, self.MARKER_SIZE), pygame.SRCALPHA)
+            pygame.draw.circle(marker, color, center, self.MARKER_RADIUS)
+            pygame.draw.circle(marker, (0, 0, 0), center, self.MARKER_RADIUS, 2)
+            self.marker_sprites.append(marker)
+        
+        if pygame.display.get_surface():
+            self.surface = self.surface.convert()
+            self.cell_sprite = self.cell_sprite.convert()
+            self.marker_sprites = [marker.convert_alpha() for marker in self.marker_sprites]
+        # The background shows through, so elements underneath are never painted over
+        self.surface.set_colorkey(renderer.BACKGROUND_COLOR, pygame.RLEACCEL)
 
 class UIRenderer:
     """Handles all UI rendering operations"""
     
-    def __init__(self, screen, graphics_manager):
+    def __init__(self, screen, graphics_manager, text_cache_bytes=TextSurfaceCache.DEFAULT_MAX_BYTES):
         self.screen = screen
         self.graphics = graphics_manager
         self.WIDTH, self.HEIGHT = screen.get_size()
@@ -14,50 +120,118 @@ class UIRenderer:
         self.PATH_COLOR = (255, 255, 255)
         self.BUTTON_COLOR = (255, 255, 255)
         self.BUTTON_HOVER_COLOR = (200, 200, 200)
+        self.OVERLAY_COLOR = (30, 30, 30)
+        self.OVERLAY_TEXT_COLOR = (230, 230, 230)
         
         # Fonts
         self.button_font = pygame.font.Font(None, 24)
         self.textbox_font = pygame.font.Font(None, 18)
         self.small_font = pygame.font.Font(None, 18)
         self.large_font = pygame.font.Font(None, 36)
-    
-    def draw_image_space(self):
-        """Draws the image space with loaded graphics"""
-        image_space_height = self.HEIGHT // 3
-        image_space_rect = pygame.Rect(self.WIDTH // 4, 0, self.WIDTH // 2, image_space_height)
         
-        pygame.draw.rect(self.screen, (0, 0, 0), image_space_rect)
+        # Rendered labels are reused across frames instead of calling font.render each time
+        self.text_cache = TextSurfaceCache(text_cache_bytes)
         
-        odysseus_image = self.graphics.get_image("odysseus")
-        if odysseus_image:
-            self._draw_scaled_image(odysseus_image, image_space_rect)
+        # Paths and progress bar blit a pre-rendered BoardLayer (False: draw every shape each frame)
+        self.use_board_layer = True
+        self._board_layer = None
+        
+        # Dirty-rect rendering: key -> (signature, rect) of the elements drawn last frame
+        self._drawn = {}
+        self._frame = []
+        self._full_redraw = True
+        
+        # Optional FrameProfiler timing each element end_frame draws
+        self.profiler = None
+        self._overlay_font = None
     
-    def _draw_scaled_image(self, image, container_rect):
-        """Draw image scaled to fit container while maintaining aspect ratio"""
-        image_rect = image.get_rect()
+    # =============================================================================
+    # DIRTY-RECT RENDERING
+    # =============================================================================
+    
+    def invalidate(self):
+        """Redraw the whole screen on the next end_frame (e.g. after the window was exposed)"""
+        self._full_redraw = True
+    
+    def begin_frame(self):
+        """Start collecting the UI elements of a frame"""
+        self._frame = []
+    
+    def add_element(self, key, signature, rect, draw):
+        """
+        Queue a UI element for the current frame, in drawing order
+        
+        Args:
+            key: Stable identifier of the element
+            signature: Value summarising every input the element's look depends on
+            rect: Screen area the element covers
+            draw: Callable that draws the element
+        """
+        self._frame.append((key, signature, rect, draw))
+    
+    def end_frame(self):
+        """
+        Redraw only the elements whose signature or rect changed since the last frame
         
-        scale_x = (container_rect.width - 20) / image_rect.width
-        scale_y = (container_rect.height - 20) / image_rect.height
-        scale = min(scale_x, scale_y, 1.0)
+        Each changed area is cleared and every element overlapping it is redrawn
+        clipped to it, so the result matches a full redraw.
         
-        if scale < 1.0:
-            new_width = int(image_rect.width * scale)
-            new_height = int(image_rect.height * scale)
-            scaled_image = pygame.transform.scale(image, (new_width, new_height))
+        Returns:
+            list: Screen rects that changed, for pygame.display.update
+        """
+        elements = self._frame
+        drawn = {key: (signature, rect) for key, signature, rect, _ in elements}
+        
+        if self._full_redraw:
+            dirty = [self.screen.get_rect()]
         else:
-            scaled_image = image
+            dirty = []
+            for key, signature, rect, _ in elements:
+                previous = self._drawn.get(key)
+                if previous is None:
+                    dirty.append(rect)
+                elif previous[0] != signature or previous[1] != rect:
+                    dirty.append(previous[1])
+                    if rect != previous[1]:
+                        dirty.append(rect)
+            # Elements that disappeared leave their area to be cleared
+            for key, (_, rect) in self._drawn.items():
+                if key not in drawn:
+                    dirty.append(rect)
         
-        scaled_rect = scaled_image.get_rect()
-        scaled_rect.center = container_rect.center
-        self.screen.blit(scaled_image, scaled_rect)
+        profiler = self.profiler
+        for area in dirty:
+            self.screen.set_clip(area)
+            self.screen.fill(self.BACKGROUND_COLOR)
+            for key, _, rect, draw in elements:
+                if rect.colliderect(area):
+                    if profiler is None:
+                        draw()
+                    else:
+                        with profiler.section(f"draw {key if isinstance(key, str) else key[0]}"):
+                            draw()
+        self.screen.set_clip(None)
+        
+        self._drawn = drawn
+        self._frame = []
+        self._full_redraw = False
+        return dirty
     
-    def draw_textbox(self, text, position=None):
-        """Draws a textbox with the given text"""
+    # =============================================================================
+    # ELEMENT GEOMETRY
+    # =============================================================================
+    
+    def get_image_space_rect(self):
+        """Rect of the image space"""
+        return pygame.Rect(self.WIDTH // 4, 0, self.WIDTH // 2, self.HEIGHT // 3)
+    
+    def get_textbox_rect(self, text, position=None):
+        """Rect draw_textbox covers for the given text"""
         lines = text.split('\n')
         line_height = 20
         total_height = len(lines) * line_height + 10
         
-        max_width = max(self.textbox_font.size(line)[0] for line in lines)
+        max_width = max(self.text_cache.size(self.textbox_font, line)[0] for line in lines)
         textbox_width = max_width + 10
         
         if position is None:
@@ -67,16 +241,126 @@ class UIRenderer:
         else:
             textbox_x, textbox_y = position
         
-        textbox_rect = pygame.Rect(textbox_x, textbox_y, textbox_width, total_height)
+        return pygame.Rect(textbox_x, textbox_y, textbox_width, total_height)
+    
+    def get_progress_bar_rect(self):
+        """Rect covering all progress bar cells"""
+        step_width = self.WIDTH // 22
+        return pygame.Rect(step_width, (self.HEIGHT // 3) + 50, 19 * step_width + self.WIDTH // 20, 20)
+    
+    def _get_overlay_font(self):
+        """Monospace font of the profiler overlay (loaded on first use)"""
+        if self._overlay_font is None:
+            self._overlay_font = pygame.font.SysFont("monospace", 13)
+        return self._overlay_font
+    
+    def get_overlay_rect(self, lines):
+        """Rect draw_overlay covers for the given lines (top left corner)"""
+        font = self._get_overlay_font()
+        # Measured in the draw color so the size lookup reuses draw_overlay's cached surfaces
+        width = max(self.text_cache.size(font, line, self.OVERLAY_TEXT_COLOR)[0] for line in lines)
+        return pygame.Rect(5, 5, width + 10, len(lines) * font.get_linesize() + 10)
+    
+    def get_path_rect(self, path):
+        """Rect covering the label and progress circles of one path"""
+        circle_y = (self.HEIGHT // 3) + 140 + path * 60
+        right = 10 * (self.WIDTH // 25) + 50 + 16
+        return pygame.Rect(0, circle_y - 35, right, 35 + 16)
+    
+    # =============================================================================
+    # BOARD LAYER
+    # =============================================================================
+    
+    def get_board_layer(self):
+        """BoardLayer for the current window size and colors, rendered on first use"""
+        key = (self.WIDTH, self.HEIGHT, self.BACKGROUND_COLOR, self.PROGRESS_BAR_COLOR, self.PATH_COLOR)
+        if self._board_layer is None or self._board_layer.key != key:
+            self._board_layer = BoardLayer(self, key)
+        return self._board_layer
+    
+    def _blit_board(self, board, rect):
+        """Blit the part of the board layer under rect"""
+        self.screen.blit(board.surface, rect, rect.move(-board.rect.x, -board.rect.y))
+    
+    # =============================================================================
+    # DRAWING
+    # =============================================================================
+    
+    def draw_image_space(self):
+        """Draws the image space with loaded graphics"""
+        image_space_rect = self.get_image_space_rect()
+        
+        pygame.draw.rect(self.screen, (0, 0, 0), image_space_rect)
+        
+        odysseus_image = self.graphics.get_scaled_image("odysseus", image_space_rect.size)
+        if odysseus_image:
+            scaled_rect = odysseus_image.get_rect(center=image_space_rect.center)
+            self.screen.blit(odysseus_image, scaled_rect)
+    
+    def _draw_scaled_image(self, image, container_rect):
+        """Draw image scaled to fit container while maintaining aspect ratio"""
+        scaled_image = self.graphics.scale_to_fit(image, container_rect.size)
+        
+        scaled_rect = scaled_image.get_rect()
+        scaled_rect.center = container_rect.center
+        self.screen.blit(scaled_image, scaled_rect)
+    
+    def draw_textbox(self, text, position=None):
+        """Draws a textbox with the given text"""
+        lines = text.split('\n')
+        line_height = 20
+        
+        textbox_rect = self.get_textbox_rect(text, position)
         pygame.draw.rect(self.screen, (255, 255, 255), textbox_rect)
         pygame.draw.rect(self.screen, (0, 0, 0), textbox_rect, 2)
         
         for i, line in enumerate(lines):
-            text_surface = self.textbox_font.render(line, True, (0, 0, 0))
-            self.screen.blit(text_surface, (textbox_x + 5, textbox_y + 5 + i * line_height))
+            text_surface = self.text_cache.render(self.textbox_font, line, (0, 0, 0))
+            self.screen.blit(text_surface, (textbox_rect.x + 5, textbox_rect.y + 5 + i * line_height))
+    
+    def get_loading_bar_rect(self):
+        """Rect of the asset loading bar on the start screen"""
+        return pygame.Rect(self.WIDTH // 4, self.HEIGHT - 40, self.WIDTH // 2, 12)
+    
+    def draw_overlay(self, lines):
+        """Draws the profiler overlay: light monospace text on a dark box"""
+        font = self._get_overlay_font()
+        overlay_rect = self.get_overlay_rect(lines)
+        pygame.draw.rect(self.screen, self.OVERLAY_COLOR, overlay_rect)
+        for i, line in enumerate(lines):
+            text_surface = self.text_cache.render(font, line, self.OVERLAY_TEXT_COLOR)
+            self.screen.blit(text_surface, (overlay_rect.x + 5, overlay_rect.y + 5 + i * font.get_linesize()))
+    
+    def draw_loading_bar(self, fraction, label="Loading graphics"):
+        """Draws the asset loading bar filled to fraction (0.0-1.0)"""
+        bar_rect = self.get_loading_bar_rect()
+        fill_rect = bar_rect.copy()
+        fill_rect.width = int(bar_rect.width * max(0.0, min(fraction, 1.0)))
+        
+        pygame.draw.rect(self.screen, self.PROGRESS_BAR_COLOR, fill_rect)
+        pygame.draw.rect(self.screen, (0, 0, 0), bar_rect, 1)
+        
+        text_surface = self.text_cache.render(self.textbox_font, f"{label}... {int(fraction * 100)}%", (0, 0, 0))
+        self.screen.blit(text_surface, (bar_rect.x, bar_rect.y - text_surface.get_height() - 2))
     
     def draw_progress_bar(self, total_progress):
         """Draws the progress bar with highlighting"""
+        if not self.use_board_layer:
+            self._draw_progress_cells(total_progress)
+            return
+        
+        board = self.get_board_layer()
+        rect = self.get_progress_bar_rect()
+        self._blit_board(board, rect)
+        
+        step_width = self.WIDTH // 22
+        for step in range(1, min(int(total_progress), 20) + 1):
+            # Each cell is overlapped by the next one, so only its visible strip is blitted
+            visible_width = board.cell_sprite.get_width() if step == 20 else step_width
+            self.screen.blit(board.cell_sprite, (step * step_width, rect.y), (0, 0, visible_width, 20))
+    
+    def _draw_progress_cells(self, total_progress):
+        """Draws all 20 progress cells shape by shape"""
         progress_bar_y = (self.HEIGHT // 3) + 50
         
         for step in range(1, 21):
@@ -87,31 +371,51 @@ class UIRenderer:
             inner_rect = pygame.Rect(rect.x + 1, rect.y + 1, rect.width - 2, rect.height - 2)
             pygame.draw.rect(self.screen, fill_color, inner_rect)
     
+    PATH_NAMES = ["battle", "craftsmanship", "fellowship", "journey"]
+    PATH_COLORS = [(255, 100, 100), (100, 255, 100), (100, 100, 255), (255, 255, 100)]
+    
     def draw_paths(self, actionpaths):
         """Draws four paths with progress indicators"""
+        for path, path_name in enumerate(self.PATH_NAMES):
+            self.draw_path(path, actionpaths.get(path_name, 0))
+    
+    def draw_path(self, path, path_progress):
+        """Draws the label and progress circles of one path"""
+        # Marker sprites need circles that do not overlap their neighbours
+        if not self.use_board_layer or self.WIDTH // 25 <= 2 * BoardLayer.MARKER_RADIUS:
+            self._draw_path_shapes(path, path_progress)
+            return
+        
+        board = self.get_board_layer()
+        self._blit_board(board, self.get_path_rect(path))
+        
+        marker = board.marker_sprites[path]
+        offset = BoardLayer.MARKER_RADIUS + 1
+        circle_y = (self.HEIGHT // 3) + 140 + path * 60
+        for step in range(1, min(int(path_progress), 10) + 1):
+            circle_x = step * (self.WIDTH // 25) + 50
+            self.screen.blit(marker, (circle_x - offset, circle_y - offset))
+    
+    def _draw_path_shapes(self, path, path_progress):
+        """Draws the label and progress circles of one path shape by shape"""
         path_start_y = (self.HEIGHT // 3) + 140
         path_spacing = 60
         path_offset_x = 50
-        path_names = ["battle", "craftsmanship", "fellowship", "journey"]
-        colors = [(255, 100, 100), (100, 255, 100), (100, 100, 255), (255, 255, 100)]
+        path_name = self.PATH_NAMES[path]
         
-        for path in range(4):
-            path_name = path_names[path]
-            path_progress = actionpaths.get(path_name, 0)
-            
-            # Draw label
-            label = self.button_font.render(path_name.capitalize(), True, (0, 0, 0))
-            label_y = path_start_y + path * path_spacing - 35
-            self.screen.blit(label, (path_offset_x, label_y))
+        # Draw label
+        label = self.text_cache.render(self.button_font, path_name.capitalize(), (0, 0, 0))
+        label_y = path_start_y + path * path_spacing - 35
+        self.screen.blit(label, (path_offset_x, label_y))
+        
+        # Draw progress circles
+        for step in range(1, 11):
+            circle_x = step * (self.WIDTH // 25) + path_offset_x
+            circle_y = path_start_y + path * path_spacing
             
-            # Draw progress circles
-            for step in range(1, 11):
-                circle_x = step * (self.WIDTH // 25) + path_offset_x
-                circle_y = path_start_y + path * path_spacing
-                
-                color = colors[path] if step <= path_progress else self.PATH_COLOR
-                pygame.draw.circle(self.screen, color, (circle_x, circle_y), 15)
-                pygame.draw.circle(self.screen, (0, 0, 0), (circle_x, circle_y), 15, 2)
+            color = self.PATH_COLORS[path] if step <= path_progress else self.PATH_COLOR
+            pygame.draw.circle(self.screen, color, (circle_x, circle_y), 15)
+            pygame.draw.circle(self.screen, (0, 0, 0), (circle_x, circle_y), 15, 2)
     
     def draw_button(self, rect, text, hover=False, text_color=(0, 0, 0), font=None):
         """Draw a button with hover effects"""
@@ -122,13 +426,13 @@ class UIRenderer:
         pygame.draw.rect(self.screen, color, rect)
         pygame.draw.rect(self.screen, (0, 0, 0), rect, 2)
         
-        text_surface = font.render(text, True, text_color)
+        text_surface = self.text_cache.render(font, text, text_color)
         text_rect = text_surface.get_rect(center=rect.center)
         self.screen.blit(text_surface, text_rect)
     
     def draw_card_count(self, rect, count):
         """Draw card count indicator on button"""
-        count_text = self.small_font.render(str(count), True, (255, 0, 0))
+        count_text = self.text_cache.render(self.small_font, str(count), (255, 0, 0))
         count_pos = (rect.right - 20, rect.top + 5)
         self.screen.blit(count_text, count_pos)
     